@@ -1,6 +1,6 @@
 import os
 
-from sqlalchemy import create_engine, func
+from sqlalchemy import create_engine, func, bindparam, inspect
 from sqlalchemy.exc import StatementError
 from sqlalchemy.orm import sessionmaker, scoped_session
 
@@ -18,6 +18,13 @@ realm_db_engine = create_engine('mysql+pymysql://%s:%s@%s/%s?charset=utf8mb4' %
                 ), pool_pre_ping=True)
 SessionHolder = scoped_session(sessionmaker(bind=realm_db_engine, autocommit=True, autoflush=False))
 
+# (attribute, column) of every character column but the primary key, for batched updates.
+CHARACTER_UPDATE_COLUMNS = [(attr.key, attr.columns[0].name) for attr in inspect(Character).column_attrs
+                            if not attr.columns[0].primary_key]
+CHARACTER_UPDATE_STATEMENT = Character.__table__.update().where(
+    Character.__table__.c.guid == bindparam('b_guid')).values(
+    {column: bindparam('b_%s' % attribute) for attribute, column in CHARACTER_UPDATE_COLUMNS})
+
 
 class RealmDatabaseManager(object):
     # Account stuff
@@ -98,6 +105,50 @@ class RealmDatabaseManager(object):
         realm_db_session.flush()
         realm_db_session.close()
 
+    # Column values of a character keyed by attribute, as taken by character_update_values.
+    @staticmethod
+    def character_get_values(character):
+        values = {attribute: getattr(character, attribute) for attribute, column in CHARACTER_UPDATE_COLUMNS}
+        values['guid'] = character.guid
+        return values
+
+    # Single UPDATE statement executed for every character values, in one transaction.
+    @staticmethod
+    def character_update_values(values_list):
+        rows = []
+        for values in values_list:
+            row = {'b_%s' % attribute: values[attribute] for attribute, column in CHARACTER_UPDATE_COLUMNS}
+            row['b_guid'] = values['guid']
+            rows.append(row)
+
+        realm_db_session = SessionHolder()
+        try:
+            realm_db_session.begin()
+            realm_db_session.execute(CHARACTER_UPDATE_STATEMENT, rows)
+            realm_db_session.commit()
+        except Exception:
+            realm_db_session.rollback()
+            raise
+        finally:
+            realm_db_session.close()
+
+    # Writes rows changed in memory (inventory, skills, deathbinds...) in one transaction.
+    @staticmethod
+    def character_rows_flush(updated_rows, deleted_rows):
+        realm_db_session = SessionHolder()
+        try:
+            realm_db_session.begin()
+            for row in updated_rows:
+                realm_db_session.merge(row)
+            for row in deleted_rows:
+                realm_db_session.delete(realm_db_session.merge(row))
+            realm_db_session.commit()
+        except Exception:
+            realm_db_session.rollback()
+            raise
+        finally:
+            realm_db_session.close()
+
     @staticmethod
     def character_inventory_get(character_guid):
         realm_db_session = SessionHolder()
@@ -103,13 +103,39 @@ class WorldDatabaseManager(object):
 
     # Item stuff
 
+    class ItemTemplateHolder:
+        ITEM_TEMPLATES = {}
+        LOADED = False
+
+        @staticmethod
+        def load_item_template(item_template):
+            WorldDatabaseManager.ItemTemplateHolder.ITEM_TEMPLATES[item_template.entry] = item_template
+
+        # Drops the templates not found by the last load (deleted from the database before a reload).
+        @staticmethod
+        def remove_item_templates_except(entries):
+            for entry in list(WorldDatabaseManager.ItemTemplateHolder.ITEM_TEMPLATES.keys()):
+                if entry not in entries:
+                    WorldDatabaseManager.ItemTemplateHolder.ITEM_TEMPLATES.pop(entry, None)
+
+    # Served from ItemTemplateHolder once WorldLoader preloaded the templates, from the database until then.
     @staticmethod
     def item_template_get_by_entry(entry):
+        if WorldDatabaseManager.ItemTemplateHolder.LOADED:
+            return WorldDatabaseManager.ItemTemplateHolder.ITEM_TEMPLATES.get(entry)
+
         world_db_session = SessionHolder()
         res = world_db_session.query(ItemTemplate).filter_by(entry=entry).first()
         world_db_session.close()
         return res
 
+    @staticmethod
+    def item_template_get_all():
+        world_db_session = SessionHolder()
+        res = world_db_session.query(ItemTemplate).all()
+        world_db_session.close()
+        return res
+
     @staticmethod
     def item_template_get_by_name(name, return_all=False):
         world_db_session = SessionHolder()
@@ -10,6 +10,8 @@ class WorldLoader:
 
     @staticmethod
     def load_data():
+        WorldLoader.load_item_templates()
+
         if config.Server.Settings.load_gameobjects:
             WorldLoader.load_gameobjects()
         else:
@@ -65,6 +67,24 @@ class WorldLoader:
         session.close()
         return length
 
+    # Also used to reload the templates after editing them in the database.
+    @staticmethod
+    def load_item_templates():
+        item_templates = WorldDatabaseManager.item_template_get_all()
+        length = len(item_templates)
+        count = 0
+
+        for item_template in item_templates:
+            WorldDatabaseManager.ItemTemplateHolder.load_item_template(item_template)
+
+            count += 1
+            Logger.progress('Loading item templates...', count, length)
+
+        WorldDatabaseManager.ItemTemplateHolder.remove_item_templates_except(
+            {item_template.entry for item_template in item_templates})
+        WorldDatabaseManager.ItemTemplateHolder.LOADED = True
+        return length
+
     @staticmethod
     def load_creature_loot_templates():
         creature_loot_templates = WorldDatabaseManager.creature_get_loot_template()
@@ -0,0 +1,123 @@
+import threading
+from time import perf_counter, sleep
+
+from game.world.WorldSessionStateHandler import WorldSessionStateHandler
+from game.world.WorldTimers import WORLD_TIMERS
+from game.world.managers.GridManager import GridManager
+from utils.ConfigManager import config
+from utils.Logger import Logger
+
+# Seconds between gameobject updates.
+GAMEOBJECT_UPDATE_INTERVAL = 1.0
+# When the loop falls behind by more than this many ticks, the missed ticks are dropped instead of run back to back.
+MAX_CATCH_UP_TICKS = 5
+# Max seconds stop() waits for the tick in progress to finish.
+STOP_TIMEOUT = 5.0
+
+
+# Single thread running every world update at a fixed timestep, phases always run in the same order and a tick never
+# overlaps the previous one. Updates work with the elapsed time since their last run, so dropped ticks only lower the
+# update rate.
+class WorldLoop(object):
+    RUNNING = False
+    THREAD = None
+
+    TICKS = 0
+    OVERRUNS = 0
+    SKIPPED_TICKS = 0
+    LAST_TICK_TIME = 0.0
+    MAX_TICK_TIME = 0.0
+    TOTAL_TICK_TIME = 0.0
+    PHASE_TIMES = {}
+
+    @staticmethod
+    def get_phases(tick_interval):
+        gameobject_ticks = max(1, round(GAMEOBJECT_UPDATE_INTERVAL / tick_interval))
+        # (name, update, run every n ticks)
+        return (
+            ('timers', WORLD_TIMERS.update, 1),
+            ('players', WorldSessionStateHandler.update_players, 1),
+            ('creatures', GridManager.update_creatures, 1),
+            ('gameobjects', GridManager.update_gameobjects, gameobject_ticks),
+            ('flush', WorldSessionStateHandler.flush_packets, 1)
+        )
+
+    @staticmethod
+    def start():
+        if WorldLoop.RUNNING:
+            return
+
+        WorldLoop.RUNNING = True
+        WorldLoop.THREAD = threading.Thread(target=WorldLoop.run, name='WorldLoop')
+        WorldLoop.THREAD.daemon = True
+        WorldLoop.THREAD.start()
+
+    # Returns once the current tick is over, nothing is updated by the loop afterwards.
+    @staticmethod
+    def stop():
+        WorldLoop.RUNNING = False
+        if WorldLoop.THREAD and WorldLoop.THREAD is not threading.current_thread():
+            WorldLoop.THREAD.join(STOP_TIMEOUT)
+
+    @staticmethod
+    def run():
+        tick_interval = config.Server.Settings.world_tick_interval
+        phases = WorldLoop.get_phases(tick_interval)
+        next_tick = perf_counter()
+
+        while WorldLoop.RUNNING:
+            WorldLoop.tick(phases)
+
+            next_tick += tick_interval
+            now = perf_counter()
+            if now < next_tick:
+                sleep(next_tick - now)
+                continue
+
+            # Overrun, the next tick starts right away
+            WorldLoop.OVERRUNS += 1
+            behind = now - next_tick
+            if behind > tick_interval * MAX_CATCH_UP_TICKS:
+                skipped = int(behind / tick_interval)
+                WorldLoop.SKIPPED_TICKS += skipped
+                next_tick = now
+                Logger.warning('World loop is %.0f ms behind, skipping %u ticks.' % (behind * 1000, skipped))
+
+    @staticmethod
+    def tick(phases):
+        tick_start = perf_counter()
+        for name, update, every_ticks in phases:
+            if WorldLoop.TICKS % every_ticks:
+                continue
+
+            phase_start = perf_counter()
+            try:
+                update()
+            except Exception as e:
+                Logger.error('World loop %s update failed: %s' % (name, e))
+            WorldLoop.PHASE_TIMES[name] = WorldLoop.PHASE_TIMES.get(name, 0.0) + perf_counter() - phase_start
+
+        tick_time = perf_counter() - tick_start
+        WorldLoop.TICKS += 1
+        WorldLoop.LAST_TICK_TIME = tick_time
+        WorldLoop.TOTAL_TICK_TIME += tick_time
+        if tick_time > WorldLoop.MAX_TICK_TIME:
+            WorldLoop.MAX_TICK_TIME = tick_time
+
+    @staticmethod
+    def get_report():
+        ticks = max(1, WorldLoop.TICKS)
+        phases = ', '.join('%s %.2f ms' % (name, total * 1000 / ticks) for name, total in WorldLoop.PHASE_TIMES.items())
+        return 'World loop: %u ticks, avg %.2f ms (%s), last %.2f ms, max %.2f ms, %u overruns, %u skipped ticks, ' \
+               '%u pending timers.' % (
+                   WorldLoop.TICKS, WorldLoop.TOTAL_TICK_TIME * 1000 / ticks, phases, WorldLoop.LAST_TICK_TIME * 1000,
+                   WorldLoop.MAX_TICK_TIME * 1000, WorldLoop.OVERRUNS, WorldLoop.SKIPPED_TICKS, WORLD_TIMERS.pending)
+
+    @staticmethod
+    def reset_stats():
+        WorldLoop.OVERRUNS = 0
+        WorldLoop.SKIPPED_TICKS = 0
+        WorldLoop.MAX_TICK_TIME = 0.0
+        WorldLoop.TOTAL_TICK_TIME = 0.0
+        WorldLoop.PHASE_TIMES = {}
+        WorldLoop.TICKS = 0
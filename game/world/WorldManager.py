@@ -1,16 +1,23 @@
+import asyncio
 import socketserver
 import threading
 import socket
 
-from time import time
+from struct import pack
+from time import time, perf_counter
 from apscheduler.schedulers.background import BackgroundScheduler
 
 from game.world.WorldLoader import WorldLoader
+from game.world.WorldLoop import WorldLoop
 from game.world.WorldSessionStateHandler import WorldSessionStateHandler
-from game.world.managers.GridManager import GridManager
+from game.world.managers.CharacterJournal import CharacterJournal
+from game.world.managers.CharacterSaveManager import CharacterSaveManager
 from game.world.opcode_handling.Definitions import Definitions
+from game.world.opcode_handling.HandlerMetrics import HandlerMetrics
 from network.packet.PacketWriter import *
 from network.packet.PacketReader import *
+from network.packet.ReceiveBuffer import ReceiveBuffer, RECV_CHUNK_SIZE
+from network.packet.SendQueue import SendQueue, AsyncSendQueue
 from database.realm.RealmDatabaseManager import *
 from database.world.WorldDatabaseManager import *
 
@@ -36,6 +43,8 @@ class WorldServerSessionHandler(socketserver.BaseRequestHandler):
         self.account_mgr = None
         self.player_mgr = None
         self.keep_alive = False
+        self.receive_buffer = ReceiveBuffer()
+        self.send_queue = None
 
     def handle(self):
         try:
@@ -45,15 +54,14 @@ class WorldServerSessionHandler(socketserver.BaseRequestHandler):
             self.player_mgr = None
             self.account_mgr = None
             self.keep_alive = True
+            self.receive_buffer = ReceiveBuffer()
+            self.send_queue = SendQueue(self.request, config.Server.Settings.outgoing_queue_size,
+                                        coalesce=config.Server.Settings.coalesce_outgoing_packets,
+                                        max_bytes=config.Server.Settings.coalesce_max_bytes)
+            self.send_queue.start()
 
             self.auth_challenge(self.request)
 
-            realm_saving_scheduler = BackgroundScheduler()
-            realm_saving_scheduler._daemon = True
-            realm_saving_scheduler.add_job(self.save_character, 'interval',
-                                           seconds=config.Server.Settings.realm_saving_interval_seconds)
-            realm_saving_scheduler.start()
-
             while self.receive(self.request) != -1 and self.keep_alive:
                 continue
 
@@ -70,6 +78,11 @@ class WorldServerSessionHandler(socketserver.BaseRequestHandler):
         self.keep_alive = False
         WorldSessionStateHandler.remove(self)
 
+        if self.send_queue:
+            self.send_queue.stop()
+        self.close_request()
+
+    def close_request(self):
         try:
             self.request.shutdown(socket.SHUT_RDWR)
             self.request.close()
@@ -77,72 +90,224 @@ class WorldServerSessionHandler(socketserver.BaseRequestHandler):
             pass
 
     def save_character(self):
-        try:
-            self.player_mgr.sync_player()
-            RealmDatabaseManager.character_update(self.player_mgr.player)
-        except AttributeError:
-            pass
+        if self.player_mgr:
+            CharacterSaveManager.save_character(self.player_mgr)
+
+    def enqueue_packet(self, packet):
+        if self.send_queue:
+            self.send_queue.put(packet)
+
+    def flush_packets(self):
+        if self.send_queue:
+            self.send_queue.flush()
 
     def auth_challenge(self, sck):
         data = pack('<6B', 0, 0, 0, 0, 0, 0)
-        sck.sendall(PacketWriter.get_packet(OpCode.SMSG_AUTH_CHALLENGE, data))
+        self.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_AUTH_CHALLENGE, data))
+        self.flush_packets()
 
     def receive(self, sck):
         try:
-            data = sck.recv(2048)
+            data = sck.recv(RECV_CHUNK_SIZE)
             if len(data) > 0:
-                reader = PacketReader(data)
-                if reader.opcode:
-                    handler, res = Definitions.get_handler_from_packet(self, reader.opcode)
-                    if handler:
-                        Logger.debug('[%s] Handling %s' % (self.client_address[0], OpCode(reader.opcode)))
-                        if handler(self, sck, reader) != 0:
-                            return -1
-                    elif res == -1:
-                        Logger.warning('[%s] Received unknown data: %s' % (self.client_address[0], data))
+                self.receive_buffer.append(data)
+                frames = self.receive_buffer.pop_frames()
+                if frames is None:
+                    Logger.warning('[%s] Received malformed packet header, closing connection.' %
+                                   self.client_address[0])
+                    return -1
+
+                for frame in frames:
+                    if self.process_frame(sck, frame) == -1:
+                        return -1
+                # Sessions not logged in yet are not flushed by the world loop
+                self.flush_packets()
             else:
                 return -1
         except OSError:
             self.disconnect()
             return -1
 
+    def process_frame(self, sck, frame):
+        reader = PacketReader(frame)
+        if reader.opcode:
+            opcode_handler, res = Definitions.get_handler_from_packet(self, reader.opcode)
+            if opcode_handler:
+                if config.Server.Settings.debug:
+                    Logger.debug('[%s] Handling %s' % (self.client_address[0], opcode_handler.opcode))
+                if not opcode_handler.can_handle(self, reader):
+                    return 0
+                if HandlerMetrics.ENABLED:
+                    start = perf_counter()
+                    res = opcode_handler.handler(self, sck, reader)
+                    HandlerMetrics.record(reader.opcode, len(frame), perf_counter() - start)
+                else:
+                    res = opcode_handler.handler(self, sck, reader)
+                if res != 0:
+                    return -1
+            elif res == -1:
+                Logger.warning('[%s] Received unknown data: %s' % (self.client_address[0], frame))
+        return 0
+
     @staticmethod
     def schedule_updates():
-        # Player updates
-        player_update_scheduler = BackgroundScheduler()
-        player_update_scheduler._daemon = True
-        player_update_scheduler.add_job(WorldSessionStateHandler.update_players, 'interval', seconds=0.1,
-                                        max_instances=24)
-        player_update_scheduler.start()
-
-        # Creature updates
-        creature_update_scheduler = BackgroundScheduler()
-        creature_update_scheduler._daemon = True
-        creature_update_scheduler.add_job(GridManager.update_creatures, 'interval', seconds=0.1,
-                                          max_instances=24)
-        creature_update_scheduler.start()
-
-        # Gameobject updates
-        gameobject_update_scheduler = BackgroundScheduler()
-        gameobject_update_scheduler._daemon = True
-        gameobject_update_scheduler.add_job(GridManager.update_gameobjects, 'interval', seconds=1.0,
-                                            max_instances=12)
-        gameobject_update_scheduler.start()
+        # Player, creature and gameobject updates
+        WorldLoop.start()
+
+        # Periodic character saves
+        CharacterSaveManager.start()
+
+        # Handler metrics dump
+        if config.Server.Settings.handler_metrics_dump_interval > 0:
+            metrics_dump_scheduler = BackgroundScheduler()
+            metrics_dump_scheduler._daemon = True
+            metrics_dump_scheduler.add_job(HandlerMetrics.dump, 'interval',
+                                           seconds=config.Server.Settings.handler_metrics_dump_interval,
+                                           max_instances=1)
+            metrics_dump_scheduler.start()
 
     @staticmethod
     def start():
         WorldLoader.load_data()
         Logger.success('World server started.')
 
+        # Restore characters left unsaved by a crash
+        CharacterJournal.open()
         WorldServerSessionHandler.schedule_updates()
 
-        ThreadedWorldServer.allow_reuse_address = True
-        ThreadedWorldServer.timeout = 10
-        with ThreadedWorldServer((config.Server.Connection.RealmServer.host, config.Server.Connection.WorldServer.port),
-                                 WorldServerSessionHandler) as world_instance:
-            try:
-                world_session_thread = threading.Thread(target=world_instance.serve_forever())
-                world_session_thread.daemon = True
-                world_session_thread.start()
-            except KeyboardInterrupt:
-                Logger.info("World server turned off.")
+        if config.Server.Settings.world_server_mode == 'asyncio':
+            AsyncWorldServerSessionHandler.serve()
+        else:
+            ThreadedWorldServer.allow_reuse_address = True
+            ThreadedWorldServer.timeout = 10
+            with ThreadedWorldServer((config.Server.Connection.RealmServer.host,
+                                      config.Server.Connection.WorldServer.port),
+                                     WorldServerSessionHandler) as world_instance:
+                try:
+                    world_session_thread = threading.Thread(target=world_instance.serve_forever())
+                    world_session_thread.daemon = True
+                    world_session_thread.start()
+                except KeyboardInterrupt:
+                    Logger.info("World server turned off.")
+
+        # Stop updating and saving the world before the last writes
+        WorldLoop.stop()
+        CharacterSaveManager.stop()
+
+        # Write pending row changes and make the journal durable before leaving
+        CharacterSaveManager.flush_rows()
+        CharacterJournal.sync()
+
+
+# Exposes the subset of the socket API used by handlers and managers (sendall, shutdown, close, getpeername) on top of
+# an asyncio transport. Writes can come from any thread (schedulers, grid broadcasts), so they are marshalled to the
+# event loop, which also keeps them in order.
+class AsyncTransportRequest(object):
+    def __init__(self, loop, transport):
+        self.loop = loop
+        self.transport = transport
+
+    def sendall(self, data):
+        if not self.transport.is_closing():
+            self.loop.call_soon_threadsafe(self._write, data)
+
+    def _write(self, data):
+        if not self.transport.is_closing():
+            self.transport.write(data)
+
+    def shutdown(self, how=None):
+        self.loop.call_soon_threadsafe(self.transport.close)
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self.transport.close)
+
+    def getpeername(self):
+        return self.transport.get_extra_info('peername')
+
+
+# Event loop based alternative to the thread-per-connection server, sessions are protocol objects and opcode handlers
+# are invoked from the loop thread. Enabled by setting Server.Settings.world_server_mode to 'asyncio'.
+class AsyncWorldServerSessionHandler(WorldServerSessionHandler, asyncio.Protocol):
+    # noinspection PyMissingConstructor
+    def __init__(self, loop):
+        self.loop = loop
+        self.request = None
+        self.client_address = None
+        self.server = None
+        self.account_mgr = None
+        self.player_mgr = None
+        self.keep_alive = False
+        self.receive_buffer = ReceiveBuffer()
+        self.send_queue = None
+
+    def connection_made(self, transport):
+        self.request = AsyncTransportRequest(self.loop, transport)
+        self.client_address = transport.get_extra_info('peername')
+
+        if not WORLD_ON:
+            transport.close()
+            return
+
+        self.keep_alive = True
+        self.send_queue = AsyncSendQueue(self.request, config.Server.Settings.outgoing_queue_size, self.loop,
+                                         coalesce=config.Server.Settings.coalesce_outgoing_packets,
+                                         max_bytes=config.Server.Settings.coalesce_max_bytes)
+        self.send_queue.start()
+
+        self.auth_challenge(self.request)
+
+    def data_received(self, data):
+        if not self.keep_alive:
+            return
+
+        self.receive_buffer.append(data)
+        frames = self.receive_buffer.pop_frames()
+        if frames is None:
+            Logger.warning('[%s] Received malformed packet header, closing connection.' % self.client_address[0])
+            self.disconnect()
+            return
+
+        for frame in frames:
+            if self.process_frame(self.request, frame) == -1 or not self.keep_alive:
+                self.disconnect()
+                return
+        # Sessions not logged in yet are not flushed by the world loop
+        self.flush_packets()
+
+    def connection_lost(self, exc):
+        if self.send_queue:
+            self.send_queue.connection_lost()
+        if self.keep_alive:
+            self.disconnect()
+
+    def pause_writing(self):
+        if self.send_queue:
+            self.send_queue.pause_writing()
+
+    def resume_writing(self):
+        if self.send_queue:
+            self.send_queue.resume_writing()
+
+    # The send queue writer closes the transport once everything queued is written.
+    def close_request(self):
+        if not self.send_queue:
+            self.request.close()
+
+    @staticmethod
+    def serve():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+
+        server = loop.run_until_complete(
+            loop.create_server(lambda: AsyncWorldServerSessionHandler(loop),
+                               config.Server.Connection.RealmServer.host,
+                               config.Server.Connection.WorldServer.port,
+                               reuse_address=True))
+        try:
+            loop.run_forever()
+        except KeyboardInterrupt:
+            Logger.info("World server turned off.")
+        finally:
+            server.close()
+            loop.run_until_complete(server.wait_closed())
+            loop.close()
@@ -3,6 +3,8 @@ from multiprocessing import Value
 
 WORLD_SESSIONS = []
 CURRENT_SESSIONS = Value('i', 0)
+# Guid -> online player, maintained on login and logout.
+PLAYERS_BY_GUID = dict()
 
 
 class WorldSessionStateHandler(object):
@@ -19,6 +21,15 @@ class WorldSessionStateHandler(object):
             CURRENT_SESSIONS.value -= 1
             WORLD_SESSIONS.remove(session)
 
+    @staticmethod
+    def add_player(player_mgr):
+        PLAYERS_BY_GUID[player_mgr.guid] = player_mgr
+
+    @staticmethod
+    def remove_player(player_mgr):
+        if PLAYERS_BY_GUID.get(player_mgr.guid) is player_mgr:
+            del PLAYERS_BY_GUID[player_mgr.guid]
+
     @staticmethod
     def disonnect_old_session(new_session):
         if not new_session or not new_session.account_mgr:
@@ -53,10 +64,9 @@ class WorldSessionStateHandler(object):
 
     @staticmethod
     def find_player_by_guid(guid_to_search):
-        for session in WORLD_SESSIONS:
-            if session.player_mgr and session.player_mgr.online:
-                if session.player_mgr.guid == guid_to_search:
-                    return session.player_mgr
+        player_mgr = PLAYERS_BY_GUID.get(guid_to_search)
+        if player_mgr and player_mgr.online:
+            return player_mgr
         return None
 
     @staticmethod
@@ -72,3 +82,9 @@ class WorldSessionStateHandler(object):
         for session in WORLD_SESSIONS:
             if session.player_mgr and session.player_mgr.online:
                 session.player_mgr.update()
+
+    # Hands packets coalesced during the current tick to each session writer (no-op if coalescing is disabled).
+    @staticmethod
+    def flush_packets():
+        for session in list(WORLD_SESSIONS):
+            session.flush_packets()
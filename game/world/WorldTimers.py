@@ -0,0 +1,107 @@
+import math
+import threading
+import time
+
+from utils.ConfigManager import config
+from utils.Logger import Logger
+
+# Each wheel level has 256 slots, a slot of level n spans 256^n ticks. With 100ms ticks the three levels cover 25.6
+# seconds, ~1.8 hours and ~19 days.
+SLOT_BITS = 8
+SLOTS = 1 << SLOT_BITS
+SLOT_MASK = SLOTS - 1
+LEVELS = 3
+
+
+class Timer(object):
+    __slots__ = ('expires', 'callback', 'args', 'active')
+
+    def __init__(self, expires, callback, args):
+        self.expires = expires
+        self.callback = callback
+        self.args = args
+        self.active = True
+
+
+# Hierarchical timer wheel, timers cost nothing until they expire: scheduling and cancelling are O(1), and each tick
+# only looks at the timers expiring in it (plus, every 256 ticks, the ones moving down a level). Callbacks run on the
+# thread calling update() (the world loop), each timer fires exactly once.
+class TimerWheel(object):
+    def __init__(self, tick_interval):
+        self.tick_interval = tick_interval
+        self.start_time = time.time()
+        self.current_tick = 0
+        self.pending = 0
+        self.wheels = [[[] for _ in range(SLOTS)] for _ in range(LEVELS)]
+        self.lock = threading.Lock()
+
+    # Calls callback(*args) in `delay` seconds (rounded up to the next tick), returns the Timer to cancel it.
+    def schedule(self, delay, callback, *args):
+        with self.lock:
+            timer = Timer(self.current_tick + max(1, math.ceil(delay / self.tick_interval)), callback, args)
+            self._insert(timer)
+            self.pending += 1
+        return timer
+
+    def cancel(self, timer):
+        if not timer:
+            return
+        with self.lock:
+            if timer.active:
+                timer.active = False
+                self.pending -= 1
+
+    # Runs every timer expired by `now`, ticks missed (e.g. a late world loop) are caught up.
+    def update(self, now=None):
+        target_tick = int(((now or time.time()) - self.start_time) / self.tick_interval)
+        expired = []
+        with self.lock:
+            while self.current_tick < target_tick:
+                for timer in self._advance():
+                    if timer.active:
+                        timer.active = False
+                        self.pending -= 1
+                        expired.append(timer)
+
+        for timer in expired:
+            try:
+                timer.callback(*timer.args)
+            except Exception as e:
+                Logger.error('Timer %s failed: %s' % (getattr(timer.callback, '__qualname__', timer.callback), e))
+
+    def _insert(self, timer):
+        delta = timer.expires - self.current_tick
+        for level in range(LEVELS):
+            if delta < 1 << (SLOT_BITS * (level + 1)):
+                self.wheels[level][(timer.expires >> (SLOT_BITS * level)) & SLOT_MASK].append(timer)
+                return
+
+        # Beyond the wheel range, park it in the top level slot reached last, it's inserted again from there.
+        top_level = LEVELS - 1
+        self.wheels[top_level][((self.current_tick >> (SLOT_BITS * top_level)) - 1) & SLOT_MASK].append(timer)
+
+    # Moves to the next tick and returns the timers of its slot.
+    def _advance(self):
+        self.current_tick += 1
+        tick = self.current_tick
+
+        # When a lower level wraps, the timers of the next slot above are spread over the levels below it.
+        for level in range(LEVELS - 1, 0, -1):
+            if tick & ((1 << (SLOT_BITS * level)) - 1) == 0:
+                slots = self.wheels[level]
+                slot = (tick >> (SLOT_BITS * level)) & SLOT_MASK
+                timers = slots[slot]
+                if timers:
+                    slots[slot] = []
+                    for timer in timers:
+                        if timer.active:
+                            self._insert(timer)
+
+        slot = tick & SLOT_MASK
+        timers = self.wheels[0][slot]
+        if timers:
+            self.wheels[0][slot] = []
+        return timers
+
+
+WORLD_TIMERS = TimerWheel(config.Server.Settings.world_tick_interval)
@@ -0,0 +1,150 @@
+import json
+import os
+import threading
+
+from database.realm.RealmDatabaseManager import RealmDatabaseManager
+from utils.ConfigManager import config
+from utils.Logger import Logger
+
+# The journal is rewritten with only the records not saved to the database yet once it grows past this size.
+COMPACT_SIZE = 8 * 1024 * 1024
+# Columns changing on every player update, a change of these alone doesn't make a new record. They are still written
+# with the next record, so at most the time played since then is lost on a crash.
+IGNORED_CHANGES = ('totaltime', 'leveltime')
+
+
+# Append only file keeping the character states not saved to the database yet, so the database can be written far less
+# often without losing progress on a crash. One JSON record per line:
+#   {"s": seq, "g": guid, "v": {column values}}  character state
+#   {"g": guid, "saved": seq}                    record `seq` (and older) of this character reached the database
+# Records are appended as characters change and fsynced together by sync(). A record is always written before the
+# database save of the same state, so replaying the latest unsaved record of each character on startup never brings
+# back an older state. Only the character rows are journaled: CharacterSaveManager flushes the pending item, skill and
+# deathbind rows before recording, so the restored characters are never ahead of those rows.
+class CharacterJournal(object):
+    FILE = None
+    LOCK = threading.Lock()
+    SEQUENCE = 0
+    # Guid -> (seq, values) of the last record
+    LAST_RECORDS = {}
+    # Guid -> seq of the last record known to be saved
+    SAVED = {}
+    DIRTY = False
+
+    @staticmethod
+    def is_enabled():
+        return bool(config.Server.Settings.realm_journal_file)
+
+    # Writes the records left by the last run into the database, then starts a new journal.
+    @staticmethod
+    def open():
+        if not CharacterJournal.is_enabled():
+            return
+
+        path = config.Server.Settings.realm_journal_file
+        pending = CharacterJournal.read_pending(path)
+        if pending:
+            RealmDatabaseManager.character_update_values(pending)
+            Logger.success('Restored %u characters from %s.' % (len(pending), path))
+
+        with CharacterJournal.LOCK:
+            CharacterJournal.FILE = open(path, 'w', encoding='utf-8')
+            CharacterJournal._sync_file()
+
+    @staticmethod
+    def read_pending(path):
+        if not os.path.exists(path):
+            return []
+
+        records = {}
+        saved = {}
+        with open(path, 'r', encoding='utf-8') as journal_file:
+            for line in journal_file:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    # Torn write of the last record before a crash
+                    continue
+
+                if 'saved' in record:
+                    saved[record['g']] = max(saved.get(record['g'], 0), record['saved'])
+                else:
+                    records[record['g']] = record
+
+        return [record['v'] for guid, record in records.items() if record['s'] > saved.get(guid, 0)]
+
+    # Appends the state of a character if it changed since its last record, returns the seq of its latest record.
+    @staticmethod
+    def record(guid, values):
+        with CharacterJournal.LOCK:
+            last_record = CharacterJournal.LAST_RECORDS.get(guid)
+            if last_record and CharacterJournal._is_unchanged(last_record[1], values):
+                return last_record[0]
+
+            CharacterJournal.SEQUENCE += 1
+            seq = CharacterJournal.SEQUENCE
+            CharacterJournal.LAST_RECORDS[guid] = (seq, values)
+            if CharacterJournal.FILE:
+                CharacterJournal.FILE.write(json.dumps({'s': seq, 'g': guid, 'v': values}) + '\n')
+                CharacterJournal.DIRTY = True
+            return seq
+
+    @staticmethod
+    def _is_unchanged(last_values, values):
+        for key, value in values.items():
+            if key not in IGNORED_CHANGES and last_values.get(key) != value:
+                return False
+        return True
+
+    @staticmethod
+    def mark_saved(guid, seq):
+        with CharacterJournal.LOCK:
+            if CharacterJournal.SAVED.get(guid, 0) >= seq:
+                return
+            CharacterJournal.SAVED[guid] = seq
+            if CharacterJournal.FILE:
+                CharacterJournal.FILE.write(json.dumps({'g': guid, 'saved': seq}) + '\n')
+                CharacterJournal.DIRTY = True
+
+    # Character logged out and saved, every record of it is covered by the database now.
+    @staticmethod
+    def forget(guid):
+        with CharacterJournal.LOCK:
+            last_record = CharacterJournal.LAST_RECORDS.pop(guid, None)
+            saved_seq = CharacterJournal.SAVED.pop(guid, 0)
+            if last_record and last_record[0] > saved_seq and CharacterJournal.FILE:
+                CharacterJournal.FILE.write(json.dumps({'g': guid, 'saved': last_record[0]}) + '\n')
+                CharacterJournal.DIRTY = True
+
+    # Makes every record appended so far durable, a single fsync for all of them.
+    @staticmethod
+    def sync():
+        with CharacterJournal.LOCK:
+            if not CharacterJournal.FILE or not CharacterJournal.DIRTY:
+                return
+
+            CharacterJournal._sync_file()
+            if CharacterJournal.FILE.tell() > COMPACT_SIZE:
+                CharacterJournal._compact()
+
+    @staticmethod
+    def _sync_file():
+        CharacterJournal.FILE.flush()
+        os.fsync(CharacterJournal.FILE.fileno())
+        CharacterJournal.DIRTY = False
+
+    # Rewrites the journal with the unsaved records only, the new file replaces the old one atomically.
+    @staticmethod
+    def _compact():
+        path = config.Server.Settings.realm_journal_file
+        compact_path = path + '.compact'
+        with open(compact_path, 'w', encoding='utf-8') as compact_file:
+            for guid, (seq, values) in CharacterJournal.LAST_RECORDS.items():
+                if seq > CharacterJournal.SAVED.get(guid, 0):
+                    compact_file.write(json.dumps({'s': seq, 'g': guid, 'v': values}) + '\n')
+            compact_file.flush()
+            os.fsync(compact_file.fileno())
+
+        CharacterJournal.FILE.close()
+        os.replace(compact_path, path)
+        CharacterJournal.FILE = open(path, 'a', encoding='utf-8')
@@ -0,0 +1,238 @@
+import random
+import threading
+from time import time, perf_counter
+
+from database.realm.RealmDatabaseManager import RealmDatabaseManager
+from game.world.managers.CharacterJournal import CharacterJournal
+from utils.ConfigManager import config
+from utils.Logger import Logger
+
+# Seconds between two checks for characters due to be saved.
+SAVE_STEP = 1.0
+# Max characters written per batch, the rest waits for the next step and is reported as backlog.
+MAX_BATCH_SIZE = 200
+# Max seconds stop() waits for the save in progress to finish.
+STOP_TIMEOUT = 10.0
+
+
+# Saves every online character each realm_saving_interval_seconds from a single thread. Characters get a random offset
+# on login so saves are spread over the interval, and the characters due at each step are written in one transaction.
+# Rows changed in memory (inventory, skills, deathbinds...) are only marked dirty by the game code and written behind by
+# the same thread at each step, repeated changes of a row result in a single write.
+# When the character journal is enabled, the state of every online character is also appended to it at each step, so a
+# crash only loses the last step instead of everything since the last save. Characters are read first, then the pending
+# rows are flushed, and only then are the characters journaled (and saved): the rows in the database are always at least
+# as recent as the journaled character, so a restored character (e.g. its money) never gets ahead of its items.
+class CharacterSaveManager(object):
+    # Guid -> [next save time, player_mgr]
+    SCHEDULE = {}
+    LOCK = threading.Lock()
+    # id(row) -> row, pending writes and deletions
+    DIRTY_ROWS = {}
+    DELETED_ROWS = {}
+    FLUSH_LOCK = threading.Lock()
+    RUNNING = False
+    THREAD = None
+    STOP_EVENT = threading.Event()
+
+    SAVES = 0
+    BATCHES = 0
+    FAILED_BATCHES = 0
+    ROW_WRITES = 0
+    FAILED_ROW_FLUSHES = 0
+    BACKLOG = 0
+    LAST_BATCH_TIME = 0.0
+    MAX_BATCH_TIME = 0.0
+    TOTAL_BATCH_TIME = 0.0
+
+    @staticmethod
+    def start():
+        if CharacterSaveManager.RUNNING:
+            return
+
+        CharacterSaveManager.RUNNING = True
+        CharacterSaveManager.STOP_EVENT.clear()
+        CharacterSaveManager.THREAD = threading.Thread(target=CharacterSaveManager.run, name='CharacterSaveManager')
+        CharacterSaveManager.THREAD.daemon = True
+        CharacterSaveManager.THREAD.start()
+
+    # Returns once the save in progress is over, the thread doesn't write anything afterwards.
+    @staticmethod
+    def stop():
+        CharacterSaveManager.RUNNING = False
+        CharacterSaveManager.STOP_EVENT.set()
+        if CharacterSaveManager.THREAD and CharacterSaveManager.THREAD is not threading.current_thread():
+            CharacterSaveManager.THREAD.join(STOP_TIMEOUT)
+
+    @staticmethod
+    def register(player_mgr):
+        next_save = time() + random.uniform(0, config.Server.Settings.realm_saving_interval_seconds)
+        with CharacterSaveManager.LOCK:
+            CharacterSaveManager.SCHEDULE[player_mgr.guid] = [next_save, player_mgr]
+
+    @staticmethod
+    def unregister(player_mgr):
+        with CharacterSaveManager.LOCK:
+            entry = CharacterSaveManager.SCHEDULE.get(player_mgr.guid)
+            if entry and entry[1] is player_mgr:
+                del CharacterSaveManager.SCHEDULE[player_mgr.guid]
+
+    @staticmethod
+    def mark_dirty(row):
+        if row is None:
+            return
+        with CharacterSaveManager.LOCK:
+            if id(row) not in CharacterSaveManager.DELETED_ROWS:
+                CharacterSaveManager.DIRTY_ROWS[id(row)] = row
+
+    @staticmethod
+    def mark_container_dirty(container):
+        for item_mgr in list(container.sorted_slots.values()):
+            CharacterSaveManager.mark_dirty(item_mgr.item_instance)
+
+    @staticmethod
+    def mark_deleted(row):
+        if row is None:
+            return
+        with CharacterSaveManager.LOCK:
+            CharacterSaveManager.DIRTY_ROWS.pop(id(row), None)
+            CharacterSaveManager.DELETED_ROWS[id(row)] = row
+
+    # Writes every pending row change, called by the save thread and forced on logout and shutdown. Returns whether
+    # nothing is left pending.
+    @staticmethod
+    def flush_rows():
+        # A single flush at a time, so an older state of a row can't be written after a newer one
+        with CharacterSaveManager.FLUSH_LOCK:
+            with CharacterSaveManager.LOCK:
+                if not CharacterSaveManager.DIRTY_ROWS and not CharacterSaveManager.DELETED_ROWS:
+                    return True
+                dirty_rows = CharacterSaveManager.DIRTY_ROWS
+                deleted_rows = CharacterSaveManager.DELETED_ROWS
+                CharacterSaveManager.DIRTY_ROWS = {}
+                CharacterSaveManager.DELETED_ROWS = {}
+
+            try:
+                RealmDatabaseManager.character_rows_flush(list(dirty_rows.values()), list(deleted_rows.values()))
+                CharacterSaveManager.ROW_WRITES += len(dirty_rows) + len(deleted_rows)
+            except Exception as e:
+                CharacterSaveManager.FAILED_ROW_FLUSHES += 1
+                Logger.error('Unable to write %u changed rows: %s' % (len(dirty_rows) + len(deleted_rows), e))
+                # Keep them for the next flush, unless changed again meanwhile
+                with CharacterSaveManager.LOCK:
+                    for key, row in deleted_rows.items():
+                        CharacterSaveManager.DIRTY_ROWS.pop(key, None)
+                        CharacterSaveManager.DELETED_ROWS[key] = row
+                    for key, row in dirty_rows.items():
+                        if key not in CharacterSaveManager.DELETED_ROWS:
+                            CharacterSaveManager.DIRTY_ROWS[key] = row
+                return False
+        return True
+
+    @staticmethod
+    def run():
+        while CharacterSaveManager.RUNNING:
+            # Keep the thread alive whatever happens, characters would not be saved anymore otherwise
+            try:
+                CharacterSaveManager.save_due()
+            except Exception as e:
+                Logger.error('Character save step failed: %s' % e)
+            CharacterSaveManager.STOP_EVENT.wait(SAVE_STEP)
+
+    @staticmethod
+    def save_due():
+        now = time()
+        interval = config.Server.Settings.realm_saving_interval_seconds
+        with CharacterSaveManager.LOCK:
+            entries = list(CharacterSaveManager.SCHEDULE.values())
+            due = [entry for entry in entries if entry[0] <= now]
+            due.sort(key=lambda entry: entry[0])
+            batch = due[:MAX_BATCH_SIZE]
+            CharacterSaveManager.BACKLOG = len(due) - len(batch)
+            for entry in batch:
+                # Don't try to catch up missed saves, a single one covers them
+                entry[0] = max(entry[0] + interval, now)
+
+        journal_enabled = CharacterJournal.is_enabled()
+        # Journal every online character, the ones due are saved from the same values
+        players = [player_mgr for next_save, player_mgr in (entries if journal_enabled else batch)
+                   if player_mgr.online and player_mgr.player]
+        values = {player_mgr.guid: CharacterSaveManager.get_values(player_mgr) for player_mgr in players}
+
+        if not CharacterSaveManager.flush_rows():
+            # Journaling or saving the characters now could put them ahead of their rows, retry next step
+            return
+
+        snapshots = CharacterSaveManager.journal(values)
+        snapshots = [snapshots[player_mgr.guid] for next_save, player_mgr in batch if player_mgr.guid in snapshots]
+        if snapshots:
+            CharacterSaveManager.save(snapshots)
+
+    @staticmethod
+    def get_values(player_mgr):
+        player_mgr.sync_player()
+        return RealmDatabaseManager.character_get_values(player_mgr.player)
+
+    # Appends the values to the journal and makes them durable, returns player guid -> (journal seq, values). The seq
+    # is 0 without journal.
+    @staticmethod
+    def journal(values):
+        if not CharacterJournal.is_enabled():
+            return {guid: (0, character_values) for guid, character_values in values.items()}
+
+        snapshots = {guid: (CharacterJournal.record(character_values['guid'], character_values), character_values)
+                     for guid, character_values in values.items()}
+        CharacterJournal.sync()
+        return snapshots
+
+    # Saves a single character right away, used on logout.
+    @staticmethod
+    def save_character(player_mgr):
+        if not player_mgr.player:
+            return
+
+        values = {player_mgr.guid: CharacterSaveManager.get_values(player_mgr)}
+        if CharacterSaveManager.flush_rows():
+            snapshot = CharacterSaveManager.journal(values)[player_mgr.guid]
+        else:
+            # Not journaled, the rows it depends on are not written yet
+            snapshot = (0, values[player_mgr.guid])
+
+        if CharacterSaveManager.save([snapshot]):
+            CharacterJournal.forget(snapshot[1]['guid'])
+
+    # Snapshots are (journal seq, column values), returns whether they were written.
+    @staticmethod
+    def save(snapshots):
+        start = perf_counter()
+        try:
+            RealmDatabaseManager.character_update_values([values for seq, values in snapshots])
+        except Exception as e:
+            CharacterSaveManager.FAILED_BATCHES += 1
+            Logger.error('Unable to save %u characters: %s' % (len(snapshots), e))
+            return False
+
+        for seq, values in snapshots:
+            if seq:
+                CharacterJournal.mark_saved(values['guid'], seq)
+
+        batch_time = perf_counter() - start
+        CharacterSaveManager.SAVES += len(snapshots)
+        CharacterSaveManager.BATCHES += 1
+        CharacterSaveManager.LAST_BATCH_TIME = batch_time
+        CharacterSaveManager.TOTAL_BATCH_TIME += batch_time
+        if batch_time > CharacterSaveManager.MAX_BATCH_TIME:
+            CharacterSaveManager.MAX_BATCH_TIME = batch_time
+        return True
+
+    @staticmethod
+    def get_report():
+        batches = max(1, CharacterSaveManager.BATCHES)
+        return 'Character saves: %u characters in %u batches (%u failed), avg %.2f ms, last %.2f ms, max %.2f ms, ' \
+               '%u scheduled, %u in backlog. Rows: %u written, %u pending (%u failed flushes).' % (
+                   CharacterSaveManager.SAVES, CharacterSaveManager.BATCHES, CharacterSaveManager.FAILED_BATCHES,
+                   CharacterSaveManager.TOTAL_BATCH_TIME * 1000 / batches, CharacterSaveManager.LAST_BATCH_TIME * 1000,
+                   CharacterSaveManager.MAX_BATCH_TIME * 1000, len(CharacterSaveManager.SCHEDULE),
+                   CharacterSaveManager.BACKLOG, CharacterSaveManager.ROW_WRITES,
+                   len(CharacterSaveManager.DIRTY_ROWS) + len(CharacterSaveManager.DELETED_ROWS),
+                   CharacterSaveManager.FAILED_ROW_FLUSHES)
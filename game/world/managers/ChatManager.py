@@ -11,9 +11,9 @@ class ChatManager(object):
 
     @staticmethod
     def send_system_message(world_session, message):
-        world_session.request.sendall(ChatManager._get_message_packet(world_session.player_mgr.guid,
-                                                                      ChatFlags.CHAT_TAG_NONE,
-                                                                      message, ChatMsgs.CHAT_MSG_SYSTEM, 0))
+        world_session.enqueue_packet(ChatManager._get_message_packet(world_session.player_mgr.guid,
+                                                                     ChatFlags.CHAT_TAG_NONE,
+                                                                     message, ChatMsgs.CHAT_MSG_SYSTEM, 0))
 
     # This message will only be shown on the client console
     #
@@ -29,7 +29,7 @@ class ChatManager(object):
     def send_notification(world_session, message):
         message_bytes = PacketWriter.string_to_bytes(message)
         data = pack('<%us' % len(message_bytes), message_bytes)
-        world_session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_NOTIFICATION, data))
+        world_session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_NOTIFICATION, data))
 
     @staticmethod
     def send_chat_message(world_session, guid, chat_flags, message, chat_type, lang, range_):
@@ -70,14 +70,14 @@ class ChatManager(object):
         if receiver.friends_manager.has_ignore(sender):
             sender_packet = ChatManager._get_message_packet(receiver.guid, receiver.chat_flags, message,
                                                             ChatMsgs.CHAT_MSG_IGNORED, lang)
-            sender.session.request.sendall(sender_packet)
+            sender.session.enqueue_packet(sender_packet)
         else:
             sender_packet = ChatManager._get_message_packet(receiver.guid, receiver.chat_flags, message,
                                                             ChatMsgs.CHAT_MSG_WHISPER_INFORM, lang)
-            sender.session.request.sendall(sender_packet)
+            sender.session.enqueue_packet(sender_packet)
             receiver_packet = ChatManager._get_message_packet(sender.guid, sender.chat_flags, message,
                                                               ChatMsgs.CHAT_MSG_WHISPER, lang)
-            receiver.session.request.sendall(receiver_packet)
+            receiver.session.enqueue_packet(receiver_packet)
 
     @staticmethod
     def _get_message_packet(guid, chat_flags, message, chat_type, lang):
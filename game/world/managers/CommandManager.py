@@ -2,11 +2,16 @@ from struct import pack
 from game.world.managers.objects.player.guild.GuildManager import GuildManager
 from database.dbc.DbcDatabaseManager import DbcDatabaseManager
 from game.world import WorldManager
+from game.world.WorldLoader import WorldLoader
+from game.world.WorldLoop import WorldLoop
 from game.world.WorldSessionStateHandler import WorldSessionStateHandler
+from game.world.managers.CharacterSaveManager import CharacterSaveManager
 from game.world.managers.GridManager import GridManager
 from game.world.managers.abstractions.Vector import Vector
+from game.world.managers.objects.ObjectManager import CREATE_CACHE_STATS
 from network.packet.PacketWriter import PacketWriter, OpCode
 from game.world.managers.ChatManager import ChatManager
+from game.world.opcode_handling.HandlerMetrics import HandlerMetrics
 from database.world.WorldDatabaseManager import WorldDatabaseManager
 from database.realm.RealmDatabaseManager import RealmDatabaseManager
 from utils.ConfigManager import config
@@ -354,7 +359,7 @@ class CommandManager(object):
             else:
                 max_distance = 10
             found_count = 0
-            for guid, gobject in list(GridManager.get_surrounding_gameobjects(world_session.player_mgr).items()):
+            for gobject in GridManager.iter_surrounding_gameobjects(world_session.player_mgr, snapshot=True):
                 distance = world_session.player_mgr.location.distance(gobject.location)
                 if distance <= max_distance:
                     found_count += 1
@@ -442,6 +447,85 @@ class CommandManager(object):
 
         return 0, ''
 
+    @staticmethod
+    def cachestats(world_session, args):
+        hits = CREATE_CACHE_STATS['hits']
+        misses = CREATE_CACHE_STATS['misses']
+        total = hits + misses
+        ratio = (hits * 100.0 / total) if total else 0.0
+
+        return 0, 'Create cache: %u hits, %u misses (%.1f%% hit rate).' % (hits, misses, ratio)
+
+    @staticmethod
+    def reloaditems(world_session, args):
+        count = WorldLoader.load_item_templates()
+        return 0, '%u item templates reloaded.' % count
+
+    @staticmethod
+    def cells(world_session, args):
+        active, sleeping, pending_sleep = GridManager.get_cell_counts()
+        return 0, 'Cells: %u active (%u going to sleep), %u sleeping.' % (active, pending_sleep, sleeping)
+
+    @staticmethod
+    def saves(world_session, args):
+        return 0, CharacterSaveManager.get_report()
+
+    @staticmethod
+    def tick(world_session, args):
+        if args.strip().lower() == 'reset':
+            WorldLoop.reset_stats()
+            return 0, 'World loop stats reset.'
+        return 0, WorldLoop.get_report()
+
+    # Outbound queue depth of the sessions with the deepest queues so far.
+    @staticmethod
+    def queues(world_session, args):
+        try:
+            limit = int(args) if args else 10
+        except ValueError:
+            return -1, 'please specify a valid number of sessions to show.'
+
+        sessions = [session for session in WorldSessionStateHandler.get_world_sessions() if session.send_queue]
+        if not sessions:
+            return 0, 'No sessions.'
+
+        sessions.sort(key=lambda session: session.send_queue.max_depth, reverse=True)
+        for session in sessions[:limit]:
+            name = session.player_mgr.player.name if session.player_mgr and session.player_mgr.player else '-'
+            ChatManager.send_system_message(world_session, '%s: %u queued, max %u (limit %u).' % (
+                name, session.send_queue.depth(), session.send_queue.max_depth, session.send_queue.max_size))
+
+        return 0, ''
+
+    @staticmethod
+    def hstats(world_session, args):
+        option = args.strip().lower()
+        if option == 'on' or option == 'off':
+            HandlerMetrics.ENABLED = option == 'on'
+            return 0, 'Handler metrics %s.' % ('enabled' if HandlerMetrics.ENABLED else 'disabled')
+        elif option == 'reset':
+            HandlerMetrics.reset()
+            return 0, 'Handler metrics reset.'
+        elif option == 'dump':
+            if not HandlerMetrics.get_report():
+                return 0, 'No handler metrics recorded, nothing written.'
+            if not HandlerMetrics.dump():
+                return -1, 'unable to write handler metrics to %s.' % config.Server.Settings.handler_metrics_file
+            return 0, 'Handler metrics written to %s.' % config.Server.Settings.handler_metrics_file
+
+        try:
+            limit = int(option) if option else 10
+        except ValueError:
+            return -1, 'use on, off, reset, dump or the number of opcodes to show.'
+
+        lines = HandlerMetrics.get_report(limit)
+        if not lines:
+            return 0, 'No handler metrics recorded%s.' % ('' if HandlerMetrics.ENABLED else ', enable them with .hstats on')
+        for line in lines:
+            ChatManager.send_system_message(world_session, line)
+
+        return 0, ''
+
 
 PLAYER_COMMAND_DEFINITIONS = {
     'help': CommandManager.help,
@@ -476,5 +560,12 @@ GM_COMMAND_DEFINITIONS = {
     'money': CommandManager.money,
     'die': CommandManager.die,
     'kick': CommandManager.kick,
-    'worldoff': CommandManager.worldoff
+    'worldoff': CommandManager.worldoff,
+    'cachestats': CommandManager.cachestats,
+    'hstats': CommandManager.hstats,
+    'cells': CommandManager.cells,
+    'tick': CommandManager.tick,
+    'saves': CommandManager.saves,
+    'reloaditems': CommandManager.reloaditems,
+    'queues': CommandManager.queues
 }
@@ -1,197 +1,375 @@
-import math
-import threading
+import time
 
-from game.world.managers.abstractions.Vector import Vector
+from game.world.managers.PositionTable import PositionTable
+from utils.ConfigManager import config
 from utils.constants.ObjectCodes import ObjectTypes
 
-TOLERANCE = 0.00001
 GRID_SIZE = 200
+# Cell coordinates are packed in 16 bits each, map id above them.
+CELL_BITS = 16
+CELL_MASK = (1 << CELL_BITS) - 1
+
+# Creature update levels of detail, by distance to the nearest player.
+LOD_FULL = 0  # Within creature_full_update_dist, every tick
+LOD_REDUCED = 1  # Within update_dist
+LOD_IDLE = 2  # Nobody can see it
+# Ticks between two updates of a creature for each level of detail (ticks are 100ms).
+LOD_INTERVALS = (1, 5, 20)
 
 GRIDS = dict()
+# Guid -> every object currently stored in a grid.
+OBJECTS_BY_GUID = dict()
+# Cell key -> keys of the 3x3 cells around it (itself included).
+NEIGHBOUR_KEYS = dict()
 
 
 class GridManager(object):
 
-    ACTIVE_GRID_KEYS = []
+    # Cells whose creatures and gameobjects are updated: every cell in the 3x3 neighbourhood of a player cell.
+    ACTIVE_GRID_KEYS = set()
+    # Active cell key -> time at which it goes to sleep, for cells with no players around anymore.
+    SLEEP_DEADLINES = dict()
+    CREATURE_TICK = 0
 
     @staticmethod
     def add_or_get(world_obj, store=False):
-        min_x, min_y, max_x, max_y = GridManager.generate_coord_data(world_obj.location)
         grid_coords = GridManager.get_grid_key(world_obj.location, world_obj.map_)
-        if grid_coords in GRIDS:
-            grid = GRIDS[grid_coords]
-        else:
-            grid = Grid(min_x, min_y, max_x, max_y, world_obj.map_)
+        grid = GRIDS.get(grid_coords)
+        if not grid:
+            cell_x, cell_y = GridManager.get_cell(world_obj.location)
+            grid = Grid(world_obj.map_, cell_x, cell_y)
             GRIDS[grid.key] = grid
+            # New cell next to a player (e.g. a creature walked into it), it's visible so it must be active
+            if GridManager.has_players_around(grid.key):
+                GridManager.ACTIVE_GRID_KEYS.add(grid.key)
 
         if store:
             grid.add(world_obj)
+            PositionTable.update_object(world_obj)
 
         return grid
 
     @staticmethod
     def update_object(world_obj):
         grid_coords = GridManager.get_grid_key(world_obj.location, world_obj.map_)
+        previous_grid_coords = world_obj.current_grid
+        PositionTable.update_object(world_obj)
 
-        if grid_coords != world_obj.current_grid:
-            if world_obj.current_grid in GRIDS:
-                grid = GRIDS[world_obj.current_grid]
-                grid.remove(world_obj)
+        if grid_coords != previous_grid_coords:
+            if previous_grid_coords in GRIDS:
+                GRIDS[previous_grid_coords].remove(world_obj)
 
             if grid_coords in GRIDS:
                 GRIDS[grid_coords].add(world_obj)
             else:
                 GridManager.add_or_get(world_obj, store=True)
 
+            GridManager.update_interest(world_obj, previous_grid_coords, grid_coords)
             world_obj.on_grid_change()
 
     @staticmethod
     def remove_object(world_obj):
         if world_obj.current_grid in GRIDS:
-            grid = GRIDS[world_obj.current_grid]
-            grid.remove(world_obj)
-            grid.send_all_in_range(world_obj.get_destroy_packet(), source=world_obj, range_=GRID_SIZE)
+            GRIDS[world_obj.current_grid].remove(world_obj)
+            GridManager.update_interest(world_obj, world_obj.current_grid, None)
+        PositionTable.remove_object(world_obj)
+        if OBJECTS_BY_GUID.get(world_obj.guid) is world_obj:
+            del OBJECTS_BY_GUID[world_obj.guid]
+        world_obj.current_grid = None
+
+    # Keeps each player's visible objects (objects_in_range) up to date when an object moves between cells. Only the
+    # cells entering or leaving the 3x3 neighbourhood are visited, so the cost follows the change, not the population.
+    @staticmethod
+    def update_interest(world_obj, previous_grid_coords, grid_coords):
+        previous_cells = GridManager.get_neighbour_keys(previous_grid_coords) \
+            if previous_grid_coords is not None else ()
+        cells = GridManager.get_neighbour_keys(grid_coords) if grid_coords is not None else ()
+        entered_grids = [GRIDS[key] for key in cells if key not in previous_cells and key in GRIDS]
+        left_grids = [GRIDS[key] for key in previous_cells if key not in cells and key in GRIDS]
+
+        # Players who start or stop seeing this object
+        for grid in entered_grids:
+            for player_mgr in list(grid.players.values()):
+                if player_mgr is not world_obj and player_mgr.online:
+                    player_mgr.add_visible_objects((world_obj,))
+        for grid in left_grids:
+            for player_mgr in list(grid.players.values()):
+                if player_mgr is not world_obj and player_mgr.online:
+                    player_mgr.destroy_near_object(world_obj.guid)
+
+        # Objects this player starts or stops seeing
+        if world_obj.get_type() != ObjectTypes.TYPE_PLAYER or grid_coords is None:
+            return
+        if previous_grid_coords is None:
+            world_obj.update_surrounding_on_me()
+            return
+
+        entered_objects = []
+        for grid in entered_grids:
+            entered_objects.extend(grid.players.values())
+            entered_objects.extend(grid.creatures.values())
+            entered_objects.extend(grid.gameobjects.values())
+        world_obj.add_visible_objects(entered_objects)
+
+        left_guids = []
+        for grid in left_grids:
+            left_guids.extend(grid.players.keys())
+            left_guids.extend(grid.creatures.keys())
+            left_guids.extend(grid.gameobjects.keys())
+        world_obj.remove_visible_objects(left_guids)
 
     @staticmethod
-    def get_surrounding(world_obj, x_s=-1, x_m=1, y_s=-1, y_m=1):
-        vector = world_obj.location
-        near_grids = set()
-
-        for x in range(x_s, x_m + 1):
-            for y in range(y_s, y_m + 1):
-                grid_coords = GridManager.get_grid_key(
-                    Vector(vector.x + (x * GRID_SIZE), vector.y + (y * GRID_SIZE), 0),
-                    world_obj.map_)
-                if grid_coords in GRIDS:
-                    near_grids.add(GRIDS[grid_coords])
+    def get_surrounding(world_obj):
+        near_grids = []
+        for grid_coords in GridManager.get_neighbour_keys(GridManager.get_grid_key(world_obj.location,
+                                                                                   world_obj.map_)):
+            grid = GRIDS.get(grid_coords)
+            if grid:
+                near_grids.append(grid)
 
         return near_grids
 
     @staticmethod
     def send_surrounding(packet, world_obj, include_self=True, exclude=None, use_ignore=False):
+        packet = GridManager.freeze_packet(packet)
+        fan_out = 0
         for grid in GridManager.get_surrounding(world_obj):
-            grid.send_all(packet, source=None if include_self else world_obj, exclude=exclude, use_ignore=use_ignore)
+            fan_out += grid.send_all(packet, source=None if include_self else world_obj, exclude=exclude,
+                                     use_ignore=use_ignore)
+        return fan_out
 
+    # Recipients come from a single range query on the map player positions instead of a distance check per player
+    # of the surrounding grids.
     @staticmethod
     def send_surrounding_in_range(packet, world_obj, range_, include_self=True, exclude=None, use_ignore=False):
-        for grid in GridManager.get_surrounding(world_obj):
-            grid.send_all_in_range(packet, range_, world_obj, include_self, exclude, use_ignore)
+        if range_ <= 0:
+            return GridManager.send_surrounding(packet, world_obj, include_self=False, exclude=exclude)
+
+        packet = GridManager.freeze_packet(packet)
+        fan_out = 0
+        for player_mgr in PositionTable.query_radius_objects(world_obj.map_, world_obj.location, range_,
+                                                             (ObjectTypes.TYPE_PLAYER,)):
+            if player_mgr.online:
+                if not include_self and player_mgr.guid == world_obj.guid:
+                    continue
+                if exclude and player_mgr.guid in exclude:
+                    continue
+                if use_ignore and player_mgr.friends_manager.has_ignore(world_obj):
+                    continue
+
+                player_mgr.session.enqueue_packet(packet)
+                fan_out += 1
 
+        return fan_out
+
+    # Broadcast packets are serialized once and the very same object is queued for every recipient, so it must not
+    # change afterwards. Mutable buffers (e.g. reused builder bytearrays) are copied once here, never per recipient.
     @staticmethod
-    def get_surrounding_objects(world_obj, object_types):
-        surrounding_objects = [{}, {}, {}]
-        for grid in GridManager.get_surrounding(world_obj):
-            if ObjectTypes.TYPE_PLAYER in object_types:
-                surrounding_objects[0] = {**surrounding_objects[0], **grid.players}
-            if ObjectTypes.TYPE_UNIT in object_types:
-                surrounding_objects[1] = {**surrounding_objects[1], **grid.creatures}
-            if ObjectTypes.TYPE_GAMEOBJECT in object_types:
-                surrounding_objects[2] = {**surrounding_objects[2], **grid.gameobjects}
+    def freeze_packet(packet):
+        if isinstance(packet, bytearray) or (isinstance(packet, memoryview) and not packet.readonly):
+            return bytes(packet)
+        return packet
+
+    # Walks the objects of the given types in the grids surrounding world_obj, straight from the grid buckets.
+    # Grids can be changed by other threads while iterating, use snapshot=True when the loop takes time or has side
+    # effects on the grids (each bucket is then copied before being walked).
+    @staticmethod
+    def iter_surrounding_objects(world_obj, object_types, snapshot=False):
+        for grid_coords in GridManager.get_neighbour_keys(GridManager.get_grid_key(world_obj.location,
+                                                                                   world_obj.map_)):
+            grid = GRIDS.get(grid_coords)
+            if grid:
+                for object_type in object_types:
+                    bucket = grid.buckets[object_type]
+                    if bucket:
+                        yield from tuple(bucket.values()) if snapshot else bucket.values()
 
-        return surrounding_objects
+    @staticmethod
+    def iter_surrounding_players(world_obj, snapshot=False):
+        return GridManager.iter_surrounding_objects(world_obj, (ObjectTypes.TYPE_PLAYER,), snapshot)
 
     @staticmethod
-    def get_surrounding_players(world_obj):
-        return GridManager.get_surrounding_objects(world_obj, [ObjectTypes.TYPE_PLAYER])[0]
+    def iter_surrounding_units(world_obj, include_players=False, snapshot=False):
+        object_types = (ObjectTypes.TYPE_PLAYER, ObjectTypes.TYPE_UNIT) if include_players else (ObjectTypes.TYPE_UNIT,)
+        return GridManager.iter_surrounding_objects(world_obj, object_types, snapshot)
 
     @staticmethod
-    def get_surrounding_units(world_obj, include_players=False):
-        object_types = [ObjectTypes.TYPE_PLAYER, ObjectTypes.TYPE_UNIT] if include_players else [ObjectTypes.TYPE_UNIT]
-        res = GridManager.get_surrounding_objects(world_obj, object_types)
-        if include_players:
-            return res[0], res[1]
-        else:
-            return res[1]
+    def iter_surrounding_gameobjects(world_obj, snapshot=False):
+        return GridManager.iter_surrounding_objects(world_obj, (ObjectTypes.TYPE_GAMEOBJECT,), snapshot)
 
     @staticmethod
-    def get_surrounding_gameobjects(world_obj):
-        return GridManager.get_surrounding_objects(world_obj, [ObjectTypes.TYPE_GAMEOBJECT])[2]
+    def get_object_by_guid(guid):
+        return OBJECTS_BY_GUID.get(guid)
 
+    # Returns the object with the given guid if it's one of `object_types` and it's in the grids surrounding world_obj.
     @staticmethod
-    def get_surrounding_player_by_guid(world_obj, guid):
-        for p_guid, player in list(GridManager.get_surrounding_players(world_obj).items()):
-            if p_guid == guid:
-                return player
+    def get_surrounding_object_by_guid(world_obj, guid, object_types):
+        world_object = OBJECTS_BY_GUID.get(guid)
+        if world_object and world_object.get_type() in object_types and world_object.current_grid in \
+                GridManager.get_neighbour_keys(GridManager.get_grid_key(world_obj.location, world_obj.map_)):
+            return world_object
         return None
 
     @staticmethod
-    def get_surrounding_unit_by_guid(world_obj, guid, include_players=False):
-        surrounding_units = GridManager.get_surrounding_units(world_obj, include_players)
-        if include_players:
-            for p_guid, player in surrounding_units[0].items():
-                if p_guid == guid:
-                    return player
-
-        creature_dict = surrounding_units[1] if include_players else surrounding_units
-        for u_guid, unit in creature_dict.items():
-            if u_guid == guid:
-                return unit
+    def get_surrounding_player_by_guid(world_obj, guid):
+        return GridManager.get_surrounding_object_by_guid(world_obj, guid, (ObjectTypes.TYPE_PLAYER,))
 
-        return None
+    @staticmethod
+    def get_surrounding_unit_by_guid(world_obj, guid, include_players=False):
+        object_types = (ObjectTypes.TYPE_PLAYER, ObjectTypes.TYPE_UNIT) if include_players else (ObjectTypes.TYPE_UNIT,)
+        return GridManager.get_surrounding_object_by_guid(world_obj, guid, object_types)
 
     @staticmethod
     def get_surrounding_gameobject_by_guid(world_obj, guid):
-        for g_guid, gameobject in list(GridManager.get_surrounding_gameobjects(world_obj).items()):
-            if g_guid == guid:
-                return gameobject
-        return None
+        return GridManager.get_surrounding_object_by_guid(world_obj, guid, (ObjectTypes.TYPE_GAMEOBJECT,))
 
     @staticmethod
-    def generate_coord_data(vector):
-        mod_x = vector.x / GRID_SIZE
-        mod_y = vector.y / GRID_SIZE
-
-        max_x = math.ceil(mod_x) * GRID_SIZE - TOLERANCE
-        max_y = math.ceil(mod_y) * GRID_SIZE - TOLERANCE
-        min_x = max_x - GRID_SIZE + TOLERANCE
-        min_y = max_y - GRID_SIZE + TOLERANCE
+    def get_cell(vector):
+        return int(vector.x // GRID_SIZE), int(vector.y // GRID_SIZE)
 
-        return min_x, min_y, max_x, max_y
+    @staticmethod
+    def get_cell_key(map_, cell_x, cell_y):
+        return (map_ << (CELL_BITS * 2)) | ((cell_x & CELL_MASK) << CELL_BITS) | (cell_y & CELL_MASK)
 
     @staticmethod
     def get_grid_key(vector, map_):
-        min_x, min_y, max_x, max_y = GridManager.generate_coord_data(vector)
-        key = '%u:%u:%u:%u:%u' % (round(min_x, 5), round(min_y, 5), round(max_x, 5),
-                                  round(max_y, 5), map_)
+        return (map_ << (CELL_BITS * 2)) | ((int(vector.x // GRID_SIZE) & CELL_MASK) << CELL_BITS) | \
+               (int(vector.y // GRID_SIZE) & CELL_MASK)
 
-        return key
+    @staticmethod
+    def get_neighbour_keys(key):
+        neighbour_keys = NEIGHBOUR_KEYS.get(key)
+        if neighbour_keys is None:
+            map_ = key >> (CELL_BITS * 2)
+            cell_x = (key >> CELL_BITS) & CELL_MASK
+            cell_y = key & CELL_MASK
+            neighbour_keys = tuple(GridManager.get_cell_key(map_, cell_x + x, cell_y + y)
+                                   for x in range(-1, 2) for y in range(-1, 2))
+            NEIGHBOUR_KEYS[key] = neighbour_keys
+        return neighbour_keys
 
     @staticmethod
     def get_grids():
         return GRIDS
 
+    @staticmethod
+    def has_players_around(key):
+        for neighbour_key in GridManager.get_neighbour_keys(key):
+            grid = GRIDS.get(neighbour_key)
+            if grid and grid.players:
+                return True
+        return False
+
+    # Called when a player enters a cell, wakes up the cells it can see.
+    @staticmethod
+    def activate_cells_around(key):
+        for neighbour_key in GridManager.get_neighbour_keys(key):
+            grid = GRIDS.get(neighbour_key)
+            if grid:
+                if neighbour_key not in GridManager.ACTIVE_GRID_KEYS:
+                    GridManager.ACTIVE_GRID_KEYS.add(neighbour_key)
+                    # Creatures stop wandering while their cell sleeps
+                    for creature in list(grid.creatures.values()):
+                        creature.schedule_random_movement()
+                GridManager.SLEEP_DEADLINES.pop(neighbour_key, None)
+
+    # Called when the last player leaves a cell, the cells nobody can see anymore go to sleep after the cooldown.
+    @staticmethod
+    def schedule_sleep_around(key):
+        deadline = time.time() + config.World.Gameplay.grid_sleep_cooldown
+        for neighbour_key in GridManager.get_neighbour_keys(key):
+            if neighbour_key in GridManager.ACTIVE_GRID_KEYS and not GridManager.has_players_around(neighbour_key):
+                GridManager.SLEEP_DEADLINES[neighbour_key] = deadline
+
+    @staticmethod
+    def sleep_idle_cells():
+        now = time.time()
+        for key, deadline in list(GridManager.SLEEP_DEADLINES.items()):
+            if deadline <= now:
+                GridManager.SLEEP_DEADLINES.pop(key, None)
+                # A player could have come back without going through activate_cells_around (e.g. same cell)
+                if not GridManager.has_players_around(key):
+                    GridManager.ACTIVE_GRID_KEYS.discard(key)
+
+    # Returns (active, sleeping, pending sleep) cell counts.
+    @staticmethod
+    def get_cell_counts():
+        active = len(GridManager.ACTIVE_GRID_KEYS)
+        return active, len(GRIDS) - active, len(GridManager.SLEEP_DEADLINES)
+
+    @staticmethod
+    def get_creature_lod(creature, players):
+        if creature.in_combat:
+            return LOD_FULL
+
+        location = creature.location
+        nearest = -1
+        for player_mgr in players:
+            distance = location.distance_sqrd(player_mgr.location.x, player_mgr.location.y, player_mgr.location.z)
+            if nearest < 0 or distance < nearest:
+                nearest = distance
+
+        if nearest < 0 or nearest > config.World.Gameplay.update_dist ** 2:
+            return LOD_IDLE
+        if nearest > config.World.Gameplay.creature_full_update_dist ** 2:
+            return LOD_REDUCED
+        return LOD_FULL
+
+    # Only creatures with something to update (moving, in combat or with pending changes) are updated, everything else
+    # is driven by WORLD_TIMERS events. They are updated at a rate depending on how close the nearest player is,
+    # spread over ticks using the guid, and the level of detail itself is only recomputed every
+    # LOD_INTERVALS[LOD_REDUCED] ticks. CreatureManager.update() works with the elapsed time since its last update, so
+    # movement is not affected by the rate.
     @staticmethod
     def update_creatures():
-        for key in GridManager.ACTIVE_GRID_KEYS:
+        GridManager.sleep_idle_cells()
+        GridManager.CREATURE_TICK += 1
+        tick = GridManager.CREATURE_TICK
+
+        # Copy, players can activate cells from other threads while we iterate
+        for key in list(GridManager.ACTIVE_GRID_KEYS):
             grid = GRIDS[key]
+            if not grid.creatures:
+                continue
+
+            players = None
             for guid, creature in list(grid.creatures.items()):
-                creature.update()
+                if not creature.needs_update():
+                    continue
+
+                if (tick + guid) % LOD_INTERVALS[LOD_REDUCED] == 0 or creature.in_combat:
+                    if players is None:
+                        players = [player_mgr for grid_key in grid.neighbour_keys if grid_key in GRIDS
+                                   for player_mgr in list(GRIDS[grid_key].players.values()) if player_mgr.online]
+                    creature.update_lod = GridManager.get_creature_lod(creature, players)
+
+                # Pending changes are always sent right away
+                if creature.dirty or (tick + guid) % LOD_INTERVALS[creature.update_lod] == 0:
+                    creature.update()
 
     @staticmethod
     def update_gameobjects():
-        for key in GridManager.ACTIVE_GRID_KEYS:
+        for key in list(GridManager.ACTIVE_GRID_KEYS):
             grid = GRIDS[key]
             for guid, gameobject in list(grid.gameobjects.items()):
                 gameobject.update()
 
 
 class Grid(object):
-    def __init__(self, min_x=0.0, min_y=0.0, max_x=0.0, max_y=0.0, map_=0.0, gameobjects=None,
-                 creatures=None, players=None, key=''):
-        self.min_x = min_x
-        self.min_y = min_y
-        self.max_x = max_x
-        self.max_y = max_y
+    def __init__(self, map_=0, cell_x=0, cell_y=0, gameobjects=None, creatures=None, players=None):
         self.map_ = map_
-        self.key = key
+        self.cell_x = cell_x
+        self.cell_y = cell_y
+        self.min_x = cell_x * GRID_SIZE
+        self.min_y = cell_y * GRID_SIZE
+        self.max_x = self.min_x + GRID_SIZE
+        self.max_y = self.min_y + GRID_SIZE
+        self.key = GridManager.get_cell_key(map_, cell_x, cell_y)
+        self.neighbour_keys = GridManager.get_neighbour_keys(self.key)
         self.gameobjects = gameobjects
         self.creatures = creatures
         self.players = players
 
-        if not key:
-            self.key = '%u:%u:%u:%u:%u' % (round(self.min_x, 5), round(self.min_y, 5), round(self.max_x, 5),
-                                           round(self.max_y, 5), self.map_)
-
         if not gameobjects:
             self.gameobjects = dict()
         if not creatures:
@@ -199,6 +377,12 @@ class Grid(object):
         if not players:
             self.players = dict()
 
+        self.buckets = {
+            ObjectTypes.TYPE_PLAYER: self.players,
+            ObjectTypes.TYPE_UNIT: self.creatures,
+            ObjectTypes.TYPE_GAMEOBJECT: self.gameobjects
+        }
+
     def has_players(self):
         return len(self.players) > 0
 
@@ -207,36 +391,37 @@ class Grid(object):
             vector = world_obj.location
             map_ = world_obj.map_
 
-        if vector and map_:
-            return self.min_x <= round(vector.x, 5) <= self.max_x and self.min_y <= round(vector.y, 5) <= self.max_y \
-                   and map_ == self.map_
+        if vector and map_ is not None:
+            return self.min_x <= vector.x < self.max_x and self.min_y <= vector.y < self.max_y and map_ == self.map_
         return False
 
     def add(self, world_obj):
         if world_obj.get_type() == ObjectTypes.TYPE_PLAYER:
             self.players[world_obj.guid] = world_obj
-            # Add Grid key to the active grid list
-            if self.key not in GridManager.ACTIVE_GRID_KEYS:
-                GridManager.ACTIVE_GRID_KEYS.append(self.key)
+            # Activate this Grid and the ones around it
+            GridManager.activate_cells_around(self.key)
         elif world_obj.get_type() == ObjectTypes.TYPE_UNIT:
             self.creatures[world_obj.guid] = world_obj
         elif world_obj.get_type() == ObjectTypes.TYPE_GAMEOBJECT:
             self.gameobjects[world_obj.guid] = world_obj
 
+        OBJECTS_BY_GUID[world_obj.guid] = world_obj
         world_obj.current_grid = self.key
 
     def remove(self, world_obj):
         if world_obj.get_type() == ObjectTypes.TYPE_PLAYER:
             self.players.pop(world_obj.guid, None)
-            # If no players left on Grid, remove its key from the active grid list
-            if len(self.players) == 0 and self.key in GridManager.ACTIVE_GRID_KEYS:
-                GridManager.ACTIVE_GRID_KEYS.remove(self.key)
+            # If no players left on Grid, the Grids nobody can see anymore will go to sleep
+            if len(self.players) == 0:
+                GridManager.schedule_sleep_around(self.key)
         elif world_obj.get_type() == ObjectTypes.TYPE_UNIT:
             self.creatures.pop(world_obj.guid, None)
         elif world_obj.get_type() == ObjectTypes.TYPE_GAMEOBJECT:
             self.gameobjects.pop(world_obj.guid, None)
 
+    # Returns the number of recipients the packet was queued for.
     def send_all(self, packet, source=None, exclude=None, use_ignore=False):
+        fan_out = 0
         for guid, player_mgr in list(self.players.items()):
             if player_mgr.online:
                 if source and player_mgr.guid == source.guid:
@@ -246,17 +431,7 @@ class Grid(object):
                 if use_ignore and source and player_mgr.friends_manager.has_ignore(source):
                     continue
 
-                threading.Thread(target=player_mgr.session.request.sendall, args=(packet,)).start()
+                player_mgr.session.enqueue_packet(packet)
+                fan_out += 1
 
-    def send_all_in_range(self, packet, range_, source, include_self=True, exclude=None, use_ignore=False):
-        if range_ <= 0:
-            self.send_all(packet, source, exclude)
-        else:
-            for guid, player_mgr in list(self.players.items()):
-                if player_mgr.online and player_mgr.location.distance(source.location) <= range_:
-                    if not include_self and player_mgr.guid == source.guid:
-                        continue
-                    if use_ignore and player_mgr.friends_manager.has_ignore(source):
-                        continue
-
-                    threading.Thread(target=player_mgr.session.request.sendall, args=(packet,)).start()
+        return fan_out
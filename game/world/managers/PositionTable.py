@@ -0,0 +1,163 @@
+import threading
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+INITIAL_CAPACITY = 64
+
+# (map id, object type) -> PositionTable
+POSITION_TABLES = dict()
+# Guid -> (map id, object type) of the table currently holding it.
+OBJECT_TABLES = dict()
+TABLES_LOCK = threading.Lock()
+
+
+# Columnar store (guid, x, y, z) of the positions of every object of one type on one map, kept in sync by GridManager.
+# Range queries are a single vectorized comparison over the columns when numpy is installed, a plain loop otherwise.
+# Objects are split per type so that, e.g., broadcasts to players don't have to scan every creature on the map.
+class PositionTable(object):
+    def __init__(self, map_, object_type):
+        self.map_ = map_
+        self.object_type = object_type
+        self.lock = threading.Lock()
+        self.count = 0
+        self.rows = dict()  # Guid -> row
+        self.objects = []  # Row -> world object
+
+        if numpy:
+            self.guids = numpy.zeros(INITIAL_CAPACITY, dtype=numpy.uint64)
+            self.xs = numpy.zeros(INITIAL_CAPACITY, dtype=numpy.float64)
+            self.ys = numpy.zeros(INITIAL_CAPACITY, dtype=numpy.float64)
+            self.zs = numpy.zeros(INITIAL_CAPACITY, dtype=numpy.float64)
+        else:
+            self.guids = []
+            self.xs = []
+            self.ys = []
+            self.zs = []
+
+    @staticmethod
+    def get_table(map_, object_type):
+        key = (map_, object_type)
+        table = POSITION_TABLES.get(key)
+        if not table:
+            with TABLES_LOCK:
+                table = POSITION_TABLES.get(key)
+                if not table:
+                    table = PositionTable(map_, object_type)
+                    POSITION_TABLES[key] = table
+        return table
+
+    @staticmethod
+    def update_object(world_obj):
+        key = (world_obj.map_, world_obj.get_type())
+        previous_key = OBJECT_TABLES.get(world_obj.guid)
+        if previous_key != key:
+            if previous_key:
+                POSITION_TABLES[previous_key].remove(world_obj.guid)
+            OBJECT_TABLES[world_obj.guid] = key
+        PositionTable.get_table(*key).set(world_obj)
+
+    @staticmethod
+    def remove_object(world_obj):
+        previous_key = OBJECT_TABLES.pop(world_obj.guid, None)
+        if previous_key:
+            POSITION_TABLES[previous_key].remove(world_obj.guid)
+
+    # Returns the guids of the objects of the given types on `map_` within `radius` of `center`.
+    @staticmethod
+    def query_radius(map_, center, radius, types):
+        guids = []
+        for object_type in types:
+            table = POSITION_TABLES.get((map_, object_type))
+            if table:
+                guids.extend(table.query(center, radius))
+        return guids
+
+    # Same as query_radius, returning the world objects instead of their guids.
+    @staticmethod
+    def query_radius_objects(map_, center, radius, types):
+        objects = []
+        for object_type in types:
+            table = POSITION_TABLES.get((map_, object_type))
+            if table:
+                objects.extend(table.query(center, radius, return_objects=True))
+        return objects
+
+    def set(self, world_obj):
+        location = world_obj.location
+        with self.lock:
+            row = self.rows.get(world_obj.guid)
+            if row is None:
+                row = self.count
+                if numpy:
+                    if row == len(self.guids):
+                        self._grow()
+                    self.guids[row] = world_obj.guid
+                else:
+                    self.guids.append(world_obj.guid)
+                    self.xs.append(0.0)
+                    self.ys.append(0.0)
+                    self.zs.append(0.0)
+                self.rows[world_obj.guid] = row
+                self.objects.append(world_obj)
+                self.count += 1
+
+            self.xs[row] = location.x
+            self.ys[row] = location.y
+            self.zs[row] = location.z
+
+    # Moves the last row into the removed one so columns stay contiguous.
+    def remove(self, guid):
+        with self.lock:
+            row = self.rows.pop(guid, None)
+            if row is None:
+                return
+
+            last = self.count - 1
+            if row != last:
+                self.guids[row] = self.guids[last]
+                self.xs[row] = self.xs[last]
+                self.ys[row] = self.ys[last]
+                self.zs[row] = self.zs[last]
+                self.objects[row] = self.objects[last]
+                self.rows[self.objects[row].guid] = row
+
+            self.objects.pop()
+            if not numpy:
+                self.guids.pop()
+                self.xs.pop()
+                self.ys.pop()
+                self.zs.pop()
+            self.count = last
+
+    def query(self, center, radius, return_objects=False):
+        radius_sqrd = radius * radius
+        with self.lock:
+            count = self.count
+            if count == 0:
+                return []
+
+            if numpy:
+                d_x = self.xs[:count] - center.x
+                d_y = self.ys[:count] - center.y
+                d_z = self.zs[:count] - center.z
+                rows = numpy.flatnonzero(d_x * d_x + d_y * d_y + d_z * d_z <= radius_sqrd)
+                if return_objects:
+                    return [self.objects[row] for row in rows.tolist()]
+                return self.guids[rows].tolist()
+
+            rows = [row for row in range(count)
+                    if (self.xs[row] - center.x) ** 2 + (self.ys[row] - center.y) ** 2 +
+                    (self.zs[row] - center.z) ** 2 <= radius_sqrd]
+            if return_objects:
+                return [self.objects[row] for row in rows]
+            return [self.guids[row] for row in rows]
+
+    def _grow(self):
+        capacity = len(self.guids) * 2
+        self.guids = numpy.resize(self.guids, capacity)
+        self.xs = numpy.resize(self.xs, capacity)
+        self.ys = numpy.resize(self.ys, capacity)
+        self.zs = numpy.resize(self.zs, capacity)
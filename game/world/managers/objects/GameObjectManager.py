@@ -7,7 +7,6 @@ from game.world.managers.GridManager import GridManager
 from game.world.managers.abstractions.Vector import Vector
 from game.world.managers.objects.ObjectManager import ObjectManager
 from network.packet.PacketWriter import PacketWriter
-from network.packet.update.UpdatePacketFactory import UpdatePacketFactory
 from utils.constants.ObjectCodes import ObjectTypes, ObjectTypeIds, HighGuid, GameObjectTypes, \
     GameObjectStates
 from utils.constants.OpCodes import OpCode
@@ -51,13 +50,14 @@ class GameObjectManager(ObjectManager):
             # TODO: Check locks for doors
             if self.state == GameObjectStates.GO_STATE_READY:
                 self.state = GameObjectStates.GO_STATE_ACTIVE
+                self.invalidate_create_cache()
                 # TODO: Trigger sripts / events on cooldown restart
                 self.send_update_surrounding()
         elif self.gobject_template.type == GameObjectTypes.TYPE_CAMERA:
             cinematic_id = self.gobject_template.data1
             if DbcDatabaseManager.cinematic_sequences_get_by_id(cinematic_id):
                 data = pack('<I', cinematic_id)
-                player.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_TRIGGER_CINEMATIC, data))
+                player.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_TRIGGER_CINEMATIC, data))
         elif self.gobject_template.type == GameObjectTypes.TYPE_CHAIR:
             slots = self.gobject_template.data0
             height = self.gobject_template.data1
@@ -137,10 +137,7 @@ class GameObjectManager(ObjectManager):
         return PacketWriter.get_packet(OpCode.SMSG_GAMEOBJECT_QUERY_RESPONSE, data)
 
     def send_update_surrounding(self):
-        update_packet = UpdatePacketFactory.compress_if_needed(
-            PacketWriter.get_packet(OpCode.SMSG_UPDATE_OBJECT,
-                                    self.get_full_update_packet(is_self=False)))
-        GridManager.send_surrounding(update_packet, self, include_self=False)
+        GridManager.send_surrounding(self.get_cached_create_packet(), self, include_self=False)
 
     # override
     def on_grid_change(self):
@@ -6,12 +6,16 @@ from database.realm.RealmDatabaseManager import RealmDatabaseManager
 from game.world import WorldManager
 from game.world.managers.GridManager import GridManager
 from game.world.managers.abstractions.Vector import Vector
-from network.packet.PacketWriter import PacketWriter, OpCode
+from network.packet.PacketBuilder import PacketBuilder
+from utils.constants.OpCodes import OpCode
 from utils.ConfigManager import config
 from utils.constants.ObjectCodes import ObjectTypes
 from utils.constants.UnitCodes import UnitFlags, SplineFlags
 from utils.constants.UpdateFields import UnitFields
 
+# Guid, start position, start time, unknown, spline flags, total time, waypoint count. Followed by each waypoint.
+MONSTER_MOVE_BUILDER = PacketBuilder(OpCode.SMSG_MONSTER_MOVE, '<Q3fIBI2I', '<3f')
+
 
 class PendingWaypoint(NamedTuple):
     id_: int
@@ -48,11 +52,15 @@ class MovementManager(object):
         if waypoint_length > 0:
             current_waypoint = self.pending_waypoints[0]
             if self.total_waypoint_timer > current_waypoint.expected_timestamp:
+                # Units can be updated at a reduced rate, skip every waypoint already passed
+                while len(self.pending_waypoints) > 1 and \
+                        self.total_waypoint_timer > self.pending_waypoints[1].expected_timestamp:
+                    self.pending_waypoints.pop(0)
+                current_waypoint = self.pending_waypoints.pop(0)
+
                 new_position = current_waypoint.location
                 self.last_position = new_position
-                self.waypoint_timer = 0
-
-                self.pending_waypoints.pop(0)
+                self.waypoint_timer = self.total_waypoint_timer - current_waypoint.expected_timestamp
             # Guess current position based on speed and time
             else:
                 guessed_distance = self.speed * self.waypoint_timer
@@ -62,6 +70,7 @@ class MovementManager(object):
                 self.unit.location.x = new_position.x
                 self.unit.location.y = new_position.y
                 self.unit.location.z = new_position.z
+                self.unit.invalidate_create_cache()
 
                 GridManager.update_object(self.unit)
         else:
@@ -90,23 +99,14 @@ class MovementManager(object):
 
         start_time = int(WorldManager.get_seconds_since_startup() * 1000)
 
-        data = pack(
-            '<Q12sIBI',
-            self.unit.guid,
-            self.unit.location.to_bytes(include_orientation=False),
-            start_time,
-            0,
-            spline_flag
-        )
-
-        waypoints_data = b''
+        waypoints_data = []
         waypoints_length = len(waypoints)
         last_waypoint = self.unit.location
         total_distance = 0
         total_time = 0
         current_id = 0
         for waypoint in waypoints:
-            waypoints_data += waypoint.to_bytes(include_orientation=False)
+            waypoints_data.extend((waypoint.x, waypoint.y, waypoint.z))
             current_distance = last_waypoint.distance(waypoint)
             current_time = current_distance / speed
             total_distance += current_distance
@@ -116,15 +116,19 @@ class MovementManager(object):
             last_waypoint = waypoint
             current_id += 1
 
-        data += pack(
-            '<2I%us' % len(waypoints_data),
-            int(total_time * 1000),
+        packet = MONSTER_MOVE_BUILDER.build_repeated(
             waypoints_length,
+            (self.unit.guid,
+             self.unit.location.x, self.unit.location.y, self.unit.location.z,
+             start_time,
+             0,
+             spline_flag,
+             int(total_time * 1000),
+             waypoints_length),
             waypoints_data
         )
 
-        GridManager.send_surrounding(PacketWriter.get_packet(OpCode.SMSG_MONSTER_MOVE, data), self.unit,
-                                     include_self=self.is_player)
+        GridManager.send_surrounding(packet, self.unit, include_self=self.is_player)
 
         # Player should dismount after some seconds have passed since FP destination is reached (Blizzlike).
         # This is also kind of a hackfix (at least for now) since the client always takes a bit more time to reach
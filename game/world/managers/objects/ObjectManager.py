@@ -1,15 +1,24 @@
-from struct import pack
+from struct import pack, Struct
 from math import pi
 
 from network.packet.update.UpdatePacketFactory import UpdatePacketFactory
 from utils.constants.ObjectCodes import ObjectTypes, ObjectTypeIds, UpdateTypes
 from utils.ConfigManager import config
 from game.world.managers.abstractions.Vector import Vector
+from network.packet.PacketBuilder import PacketBuilder
 from network.packet.PacketWriter import PacketWriter
 from utils.constants.OpCodes import OpCode
 from utils.constants.UpdateFields \
     import ContainerFields, ItemFields, PlayerFields, UnitFields, ObjectFields, GameObjectFields
 
+CREATE_CACHE_STATS = {'hits': 0, 'misses': 0}
+
+# Transport guid, transport x, y, z, o, x, y, z, o, pitch, movement flags, fall time, walk, run, swim speeds, turn rate
+MOVEMENT_FIELDS_STRUCT = Struct('<Q9fII4f')
+# Number of transactions, update type and guid, followed by the movement fields
+MOVEMENT_UPDATE_STRUCT = Struct('<IBQ' + MOVEMENT_FIELDS_STRUCT.format.lstrip('<'))
+DESTROY_OBJECT_BUILDER = PacketBuilder(OpCode.SMSG_DESTROY_OBJECT, '<Q')
+
 
 class ObjectManager(object):
     def __init__(self,
@@ -56,10 +65,14 @@ class ObjectManager(object):
         self.object_type = [ObjectTypes.TYPE_OBJECT]
         self.update_packet_factory = UpdatePacketFactory()
 
-        self.current_grid = ''
+        self.current_grid = None
         self.last_tick = 0
         self.movement_spline = None
 
+        # Create data as seen by other players, reused until a field or the position changes
+        self.create_data_cache = None
+        self.create_packet_cache = None
+
     def get_object_type_value(self):
         type_value = 0
         for type_ in self.object_type:
@@ -103,13 +116,8 @@ class ObjectManager(object):
         return data
 
     def get_movement_update_packet(self):
-        # Base structure
-        data = self._get_base_structure(UpdateTypes.MOVEMENT)
-
-        # Normal update fields
-        data += self._get_movement_fields()
-
-        return data
+        # Base structure and movement fields in a single pack
+        return MOVEMENT_UPDATE_STRUCT.pack(1, UpdateTypes.MOVEMENT, self.guid, *self._get_movement_values())
 
     def reset_fields(self):
         # Reset updated fields
@@ -124,35 +132,28 @@ class ObjectManager(object):
         )
 
     def _get_movement_fields(self):
-        data = pack(
-            '<Q9fI',
-            self.transport_id,
-            self.transport.x,
-            self.transport.y,
-            self.transport.z,
-            self.transport.o,
-            self.location.x,
-            self.location.y,
-            self.location.z,
-            self.location.o,
-            self.pitch,
-            self.movement_flags
-        )
-
-        # TODO: NOT WORKING!
+        # TODO: Movement spline is NOT WORKING, it would go between movement flags and fall time.
         # if self.movement_spline:
         #    data += self.movement_spline.to_bytes()
-
-        data += pack(
-            '<I4f',
-            0,  # Fall Time
-            self.walk_speed,
-            self.running_speed,
-            self.swim_speed,
-            self.turn_rate
-         )
-
-        return data
+        return MOVEMENT_FIELDS_STRUCT.pack(*self._get_movement_values())
+
+    def _get_movement_values(self):
+        return (self.transport_id,
+                self.transport.x,
+                self.transport.y,
+                self.transport.z,
+                self.transport.o,
+                self.location.x,
+                self.location.y,
+                self.location.z,
+                self.location.o,
+                self.pitch,
+                self.movement_flags,
+                0,  # Fall Time
+                self.walk_speed,
+                self.running_speed,
+                self.swim_speed,
+                self.turn_rate)
 
     def _get_fields_update(self):
         data = pack('<B', self.update_packet_factory.update_mask.block_count)
@@ -164,19 +165,53 @@ class ObjectManager(object):
 
         return data
 
+    def get_cached_create_data(self):
+        if self.create_data_cache:
+            CREATE_CACHE_STATS['hits'] += 1
+            return self.create_data_cache
+
+        CREATE_CACHE_STATS['misses'] += 1
+        # Building the data writes every field, so only store it once it's done
+        create_data = self.get_full_update_packet(is_self=False)
+        self.create_data_cache = create_data
+        return create_data
+
+    def get_cached_create_packet(self):
+        if self.create_packet_cache:
+            CREATE_CACHE_STATS['hits'] += 1
+            return self.create_packet_cache
+
+        create_data = self.get_cached_create_data()
+        if not create_data:
+            return None
+
+        create_packet = UpdatePacketFactory.compress_if_needed(
+            PacketWriter.get_packet(OpCode.SMSG_UPDATE_OBJECT, create_data))
+        self.create_packet_cache = create_packet
+        return create_packet
+
+    def invalidate_create_cache(self):
+        self.create_data_cache = None
+        self.create_packet_cache = None
+
     def set_int32(self, index, value):
+        self.create_data_cache = self.create_packet_cache = None
         self.update_packet_factory.update(index, value, 'i')
 
     def set_uint32(self, index, value):
+        self.create_data_cache = self.create_packet_cache = None
         self.update_packet_factory.update(index, value, 'I')
 
     def set_int64(self, index, value):
+        self.create_data_cache = self.create_packet_cache = None
         self.update_packet_factory.update(index, value, 'q')
 
     def set_uint64(self, index, value):
+        self.create_data_cache = self.create_packet_cache = None
         self.update_packet_factory.update(index, value, 'Q')
 
     def set_float(self, index, value):
+        self.create_data_cache = self.create_packet_cache = None
         self.update_packet_factory.update(index, value, 'f')
 
     # override
@@ -200,5 +235,8 @@ class ObjectManager(object):
         return ObjectTypeIds.ID_OBJECT
 
     def get_destroy_packet(self):
-        data = pack('<Q', self.guid)
-        return PacketWriter.get_packet(OpCode.SMSG_DESTROY_OBJECT, data)
+        return ObjectManager.get_destroy_packet_for(self.guid)
+
+    @staticmethod
+    def get_destroy_packet_for(guid):
+        return DESTROY_OBJECT_BUILDER.build(guid)
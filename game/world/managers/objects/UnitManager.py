@@ -7,6 +7,7 @@ from game.world import WorldManager
 from game.world.managers.GridManager import GridManager
 from game.world.managers.objects.MovementManager import MovementManager
 from game.world.managers.objects.ObjectManager import ObjectManager
+from network.packet.PacketBuilder import PacketBuilder
 from network.packet.PacketWriter import PacketWriter, OpCode
 from network.packet.update.UpdatePacketFactory import UpdatePacketFactory
 from utils import Formulas
@@ -16,6 +17,10 @@ from utils.constants.ObjectCodes import ObjectTypes, ObjectTypeIds, HighGuid, At
 from utils.constants.UnitCodes import UnitFlags, StandState, WeaponMode, SplineFlags
 from utils.constants.UpdateFields import UnitFields
 
+ATTACK_START_BUILDER = PacketBuilder(OpCode.SMSG_ATTACKSTART, '<2Q')
+ATTACK_STOP_BUILDER = PacketBuilder(OpCode.SMSG_ATTACKSTOP, '<2QI')
+ATTACKER_STATE_UPDATE_BUILDER = PacketBuilder(OpCode.SMSG_ATTACKERSTATEUPDATE, '<I2QIBIf7I')
+
 
 class DamageInfoHolder:
     def __init__(self,
@@ -247,15 +252,13 @@ class UnitManager(ObjectManager):
         self.send_melee_attack_stop(victim.guid if victim else self.guid)
 
     def send_melee_attack_start(self, victim_guid):
-        data = pack('<2Q', self.guid, victim_guid)
-        GridManager.send_surrounding(PacketWriter.get_packet(OpCode.SMSG_ATTACKSTART, data), self)
+        GridManager.send_surrounding(ATTACK_START_BUILDER.build(self.guid, victim_guid), self)
 
     def send_melee_attack_stop(self, victim_guid):
         # Last uint32 is "deceased"; can be either 1 (self is dead), or 0, (self is alive).
         # Forces the unit to face the corpse and disables clientside
         # turning (UnitFlags.DisableMovement) CGUnit_C::OnAttackStop
-        data = pack('<2QI', self.guid, victim_guid, 0 if self.is_alive else 1)
-        GridManager.send_surrounding(PacketWriter.get_packet(OpCode.SMSG_ATTACKSTOP, data), self)
+        GridManager.send_surrounding(ATTACK_STOP_BUILDER.build(self.guid, victim_guid, 0 if self.is_alive else 1), self)
 
     def update_melee_attacking_state(self):
         swing_error = AttackSwingError.NONE
@@ -389,22 +392,20 @@ class UnitManager(ObjectManager):
         return damage_info
 
     def send_attack_state_update(self, damage_info):
-        data = pack('<I2QIBIf7I',
-                    damage_info.hit_info,
-                    damage_info.attacker.guid,
-                    damage_info.target.guid,
-                    damage_info.total_damage,
-                    1,  # Sub damage count
-                    damage_info.damage_school_mask,
-                    damage_info.total_damage,
-                    damage_info.damage,
-                    damage_info.absorb,
-                    damage_info.target_state,
-                    damage_info.resist,
-                    0, 0,
-                    damage_info.blocked_amount)
-        GridManager.send_surrounding(PacketWriter.get_packet(OpCode.SMSG_ATTACKERSTATEUPDATE, data), self,
-                                     include_self=self.get_type() == ObjectTypes.TYPE_PLAYER)
+        packet = ATTACKER_STATE_UPDATE_BUILDER.build(damage_info.hit_info,
+                                                     damage_info.attacker.guid,
+                                                     damage_info.target.guid,
+                                                     damage_info.total_damage,
+                                                     1,  # Sub damage count
+                                                     damage_info.damage_school_mask,
+                                                     damage_info.total_damage,
+                                                     damage_info.damage,
+                                                     damage_info.absorb,
+                                                     damage_info.target_state,
+                                                     damage_info.resist,
+                                                     0, 0,
+                                                     damage_info.blocked_amount)
+        GridManager.send_surrounding(packet, self, include_self=self.get_type() == ObjectTypes.TYPE_PLAYER)
 
         # Damage effects
         self.deal_damage(damage_info.target, damage_info.total_damage)
@@ -668,6 +669,8 @@ class UnitManager(ObjectManager):
 
     def set_dirty(self, is_dirty=True):
         self.dirty = is_dirty
+        if is_dirty:
+            self.invalidate_create_cache()
 
     # override
     def on_grid_change(self):
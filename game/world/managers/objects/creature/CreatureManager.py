@@ -4,7 +4,8 @@ from struct import unpack, pack
 
 from database.dbc.DbcDatabaseManager import DbcDatabaseManager
 from database.world.WorldDatabaseManager import WorldDatabaseManager
-from game.world.managers.GridManager import GridManager
+from game.world.WorldTimers import WORLD_TIMERS
+from game.world.managers.GridManager import GridManager, LOD_FULL
 from game.world.managers.abstractions.Vector import Vector
 from game.world.managers.objects.UnitManager import UnitManager
 from game.world.managers.objects.item.ItemManager import ItemManager
@@ -59,10 +60,12 @@ class CreatureManager(UnitManager):
             self.fully_loaded = False
             self.is_evading = False
             self.has_offhand_weapon = False
-            self.respawn_timer = 0
             self.is_spawned = True
-            self.last_random_movement = 0
-            self.random_movement_wait_time = randint(1, 12)
+            # Scheduled events (WORLD_TIMERS)
+            self.respawn_timer = None
+            self.despawn_timer = None
+            self.random_movement_timer = None
+            self.update_lod = LOD_FULL
 
             self.loot_manager = CreatureLootManager(self)
 
@@ -78,6 +81,7 @@ class CreatureManager(UnitManager):
 
     def load(self):
         GridManager.add_or_get(self, True)
+        self.schedule_random_movement()
 
     def generate_display_id(self):
         display_id_list = list(filter((0).__ne__, [self.creature_template.display_id1,
@@ -110,10 +114,10 @@ class CreatureManager(UnitManager):
                     0,  # durability
                     0,  # stack count
                 )
-                world_session.request.sendall(ItemManager(item_template=vendor_data_entry.item_template).query_details())
+                world_session.enqueue_packet(ItemManager(item_template=vendor_data_entry.item_template).query_details())
 
         session.close()
-        world_session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_LIST_INVENTORY, data))
+        world_session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_LIST_INVENTORY, data))
 
     def finish_loading(self):
         if self.creature_template and self.creature_instance:
@@ -246,6 +250,10 @@ class CreatureManager(UnitManager):
     def demorph(self):
         self.set_display_id(self.generate_display_id())
 
+    # Wandering, respawn and corpse removal are scheduled events, update() only needs to run while this returns True.
+    def needs_update(self):
+        return self.dirty or (self.is_alive and (self.in_combat or self.movement_manager.should_update_waypoints))
+
     # override
     def update(self):
         now = time.time()
@@ -255,23 +263,6 @@ class CreatureManager(UnitManager):
             if self.is_alive:
                 # Movement Updates
                 self.movement_manager.update_pending_waypoints(elapsed)
-                # Random Movement
-                if not self.in_combat and self.creature_instance.movement_type == MovementTypes.WANDER:
-                    if len(self.movement_manager.pending_waypoints) == 0:
-                        if now > self.last_random_movement + self.random_movement_wait_time:
-                            self.movement_manager.move_random(self.spawn_position,
-                                                              self.creature_instance.wander_distance)
-                            self.random_movement_wait_time = randint(1, 12)
-                            self.last_random_movement = now
-            # Dead
-            else:
-                self.respawn_timer += elapsed
-                if self.respawn_timer >= self.respawn_time:
-                    self.respawn()
-                # Destroy body when creature is about to respawn
-                elif self.is_spawned and self.respawn_timer >= self.respawn_time * 0.8:
-                    self.is_spawned = False
-                    GridManager.send_surrounding(self.get_destroy_packet(), self, include_self=False)
         self.last_tick = now
 
         if self.dirty:
@@ -293,12 +284,46 @@ class CreatureManager(UnitManager):
         self.killed_by = None
 
         self.is_spawned = True
-        self.respawn_timer = 0
+        WORLD_TIMERS.cancel(self.respawn_timer)
+        WORLD_TIMERS.cancel(self.despawn_timer)
+        self.respawn_timer = None
+        self.despawn_timer = None
         self.respawn_time = randint(self.creature_instance.spawntimesecsmin, self.creature_instance.spawntimesecsmax)
 
         if force_update:
             GridManager.send_surrounding(self.generate_proper_update_packet(create=True), self, include_self=False)
 
+        self.schedule_random_movement()
+
+    # Destroys the body when the creature is about to respawn.
+    def despawn(self):
+        self.despawn_timer = None
+        if self.is_spawned:
+            self.is_spawned = False
+            GridManager.send_surrounding(self.get_destroy_packet(), self, include_self=False)
+
+    def schedule_random_movement(self, delay=None):
+        if self.creature_instance.movement_type != MovementTypes.WANDER or self.random_movement_timer:
+            return
+
+        self.random_movement_timer = WORLD_TIMERS.schedule(delay if delay is not None else randint(1, 12),
+                                                           self.on_random_movement)
+
+    # Creatures in cells nobody can see stop wandering, GridManager wakes them up when their cell is activated again.
+    def on_random_movement(self):
+        self.random_movement_timer = None
+        if not self.is_alive or self.current_grid not in GridManager.ACTIVE_GRID_KEYS:
+            return
+
+        if self.in_combat or len(self.movement_manager.pending_waypoints) > 0:
+            self.schedule_random_movement()
+            return
+
+        # Not updated while idle, movement time starts now
+        self.last_tick = time.time()
+        self.movement_manager.move_random(self.spawn_position, self.creature_instance.wander_distance)
+        self.schedule_random_movement(max(self.movement_manager.total_waypoint_time, randint(1, 12)))
+
     # override
     def die(self, killer=None):
         # Stop creature movement on death
@@ -315,6 +340,13 @@ class CreatureManager(UnitManager):
         if self.loot_manager.has_loot():
             self.set_lootable(True)
 
+        WORLD_TIMERS.cancel(self.random_movement_timer)
+        WORLD_TIMERS.cancel(self.respawn_timer)
+        WORLD_TIMERS.cancel(self.despawn_timer)
+        self.random_movement_timer = None
+        self.despawn_timer = WORLD_TIMERS.schedule(self.respawn_time * 0.8, self.despawn)
+        self.respawn_timer = WORLD_TIMERS.schedule(self.respawn_time, self.respawn)
+
         self.set_dirty()
 
     def reward_kill_xp(self, player):
@@ -1,4 +1,4 @@
-from database.realm.RealmDatabaseManager import RealmDatabaseManager
+from game.world.managers.CharacterSaveManager import CharacterSaveManager
 from game.world.WorldSessionStateHandler import WorldSessionStateHandler
 from game.world.managers.objects.item.ItemManager import ItemManager
 from network.packet.update.UpdatePacketFactory import ContainerFields
@@ -70,7 +70,7 @@ class ContainerManager(ItemManager):
             if item_mgr:
                 item_mgr.current_slot = slot
                 self.sorted_slots[slot] = item_mgr
-                RealmDatabaseManager.character_inventory_update_item(item_mgr.item_instance)
+                CharacterSaveManager.mark_dirty(item_mgr.item_instance)
 
             if item_mgr.item_template.bonding == ItemBondingTypes.BIND_WHEN_PICKED_UP:
                 item_mgr.set_binding(True)
@@ -117,12 +117,12 @@ class ContainerManager(ItemManager):
                 if stack_missing >= amount_left:
                     item_mgr.item_instance.stackcount += amount_left
                     amount_left = 0
-                    RealmDatabaseManager.character_inventory_update_item(item_mgr.item_instance)
+                    CharacterSaveManager.mark_dirty(item_mgr.item_instance)
                     break
                 else:
                     item_mgr.item_instance.stackcount += stack_missing
                     amount_left -= stack_missing
-                    RealmDatabaseManager.character_inventory_update_item(item_mgr.item_instance)
+                    CharacterSaveManager.mark_dirty(item_mgr.item_instance)
         return amount_left
 
     def contains_item(self, item_template):
@@ -21,21 +21,21 @@ class FriendsManager(object):
             if status == FriendResults.FRIEND_ADDED_ONLINE:
                 data += pack('<B3I', 1, player_mgr.zone, player_mgr.level, player_mgr.player.class_)
 
-            self.owner.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_FRIEND_STATUS, data))
+            self.owner.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_FRIEND_STATUS, data))
             self.send_friends()
 
     def remove_friend(self, player_mgr):
         if player_mgr.guid in self.friends:
             self.friends.pop(player_mgr.guid)
             data = pack('<BQ', FriendResults.FRIEND_REMOVED, player_mgr.guid)
-            self.owner.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_FRIEND_STATUS, data))
+            self.owner.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_FRIEND_STATUS, data))
             self.send_friends()
 
     def remove_ignore(self, player_mgr):
         if player_mgr.guid in self.ignores:
             self.ignores.pop(player_mgr.guid)
             data = pack('<BQ', FriendResults.FRIEND_IGNORE_REMOVED, player_mgr.guid)
-            self.owner.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_FRIEND_STATUS, data))
+            self.owner.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_FRIEND_STATUS, data))
             self.send_ignores()
 
     def has_friend(self, player_mgr):
@@ -50,7 +50,7 @@ class FriendsManager(object):
             self.ignores[player_mgr.guid] = player_mgr.guid
             data = pack('<BQ', FriendResults.FRIEND_IGNORE_ADDED, player_mgr.guid)
             packet = PacketWriter.get_packet(OpCode.SMSG_FRIEND_STATUS, data)
-            self.owner.session.request.sendall(packet)
+            self.owner.session.enqueue_packet(packet)
             self.send_ignores()
 
     def send_friends(self):
@@ -62,7 +62,7 @@ class FriendsManager(object):
                 data += pack('<QB3I', player_mgr.guid, 1, player_mgr.zone, player_mgr.level, player_mgr.player.class_)
 
         packet = PacketWriter.get_packet(OpCode.SMSG_FRIEND_LIST, data)
-        self.owner.session.request.sendall(packet)
+        self.owner.session.enqueue_packet(packet)
 
     def send_ignores(self):
         data = pack('<B', len(self.ignores))
@@ -73,7 +73,7 @@ class FriendsManager(object):
                 data += pack('<Q', player_mgr.guid)
 
         packet = PacketWriter.get_packet(OpCode.SMSG_IGNORE_LIST, data)
-        self.owner.session.request.sendall(packet)
+        self.owner.session.enqueue_packet(packet)
 
     def send_friends_and_ignores(self):
         self.send_friends()
@@ -90,7 +90,7 @@ class FriendsManager(object):
                                 self.owner.level,
                                 self.owner.player.class_)
                     packet = PacketWriter.get_packet(OpCode.SMSG_FRIEND_STATUS, data)
-                    session.player_mgr.session.request.sendall(packet)
+                    session.player_mgr.session.enqueue_packet(packet)
 
     # TODO: Use db to find which players have us in their friendslist.
     def send_offline_notification(self):
@@ -100,7 +100,7 @@ class FriendsManager(object):
                 if session.player_mgr.friends_manager.has_friend(self.owner):
                     data = pack('<BQB', FriendResults.FRIEND_OFFLINE, self.owner.guid, 0)
                     packet = PacketWriter.get_packet(OpCode.SMSG_FRIEND_STATUS, data)
-                    session.player_mgr.session.request.sendall(packet)
+                    session.player_mgr.session.enqueue_packet(packet)
 
     # OnLevelUp, ZoneChange, Etc, update self on our friends lists.
     # TODO: Use db to find which players have us in their friendslist.
@@ -2,8 +2,9 @@ from struct import pack
 from utils import Formulas
 from network.packet.PacketWriter import PacketWriter, OpCode
 from utils.constants.GroupCodes import PartyOperations, PartyResults
-from utils.constants.ObjectCodes import WhoPartyStatus, LootMethods
-from game.world.managers.GridManager import GridManager
+from utils.ConfigManager import config
+from utils.constants.ObjectCodes import WhoPartyStatus, LootMethods, ObjectTypes
+from game.world.managers.PositionTable import PositionTable
 from game.world.opcode_handling.handlers.player.NameQueryHandler import NameQueryHandler
 
 MAX_GROUP_SIZE = 5
@@ -101,7 +102,7 @@ class GroupManager(object):
 
                 if is_kicked and member == player_mgr: # 'You have been removed from the group.'
                     packet = PacketWriter.get_packet(OpCode.SMSG_GROUP_UNINVITE)
-                    player_mgr.session.request.sendall(packet)
+                    player_mgr.session.enqueue_packet(packet)
 
         if disband:
             self.members.clear()
@@ -159,8 +160,16 @@ class GroupManager(object):
     def is_party_member(self, player):
         return player in self.members.values()
 
+    # Members within visibility range of the killer. The killer is always included, even when missing from the position
+    # table (e.g. removed while teleporting).
+    def get_surrounding_members(self, player):
+        in_range = set(PositionTable.query_radius(player.map_, player.location, config.World.Gameplay.update_dist,
+                                                  (ObjectTypes.TYPE_PLAYER,)))
+        in_range.add(player.guid)
+        return [m for m in self.members.values() if m.guid in in_range]
+
     def reward_group_money(self, player, creature):
-        surrounding = [m for m in self.members.values() if m in GridManager.get_surrounding_players(player).values()]
+        surrounding = self.get_surrounding_members(player)
         share = int(creature.loot_manager.current_money / len(surrounding))
         # Append div remainder to the player who killed the creature for now.
         remainder = int(creature.loot_manager.current_money % len(surrounding))
@@ -170,16 +179,16 @@ class GroupManager(object):
             # TODO: MSG_SPLIT_MONEY seems not to have any effect on the client.
             # data = pack('<Q2I', creature.guid, creature.loot_manager.current_money, ply_share)
             # split_packet = PacketWriter.get_packet(OpCode.MSG_SPLIT_MONEY, data)
-            # member.session.request.sendall(split_packet)
+            # member.session.enqueue_packet(split_packet)
             data = pack('<I', player_share)
-            member.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_LOOT_MONEY_NOTIFY, data))
+            member.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_LOOT_MONEY_NOTIFY, data))
             member.mod_money(player_share)
 
         creature.loot_manager.clear_money()
         self.send_packet_to_members(PacketWriter.get_packet(OpCode.SMSG_LOOT_CLEAR_MONEY))
 
     def reward_group_xp(self, player, creature, is_elite):
-        surrounding = [m for m in self.members.values() if m in GridManager.get_surrounding_players(player).values()]
+        surrounding = self.get_surrounding_members(player)
         surrounding.sort(key=lambda players: players.level, reverse=True)  # Highest level on top
         sum_levels = sum(player.level for player in surrounding)
         base_xp = Formulas.CreatureFormulas.xp_reward(creature.level, surrounding[0].level, is_elite)
@@ -216,7 +225,7 @@ class GroupManager(object):
         )
 
         packet = PacketWriter.get_packet(OpCode.SMSG_GROUP_DECLINE, data)
-        self.party_leader.session.request.sendall(packet)
+        self.party_leader.session.enqueue_packet(packet)
 
     def send_packet_to_members(self, packet, ignore=None, source=None, use_ignore=False):
         for member in self.members.values():
@@ -225,7 +234,7 @@ class GroupManager(object):
             if use_ignore and source and member.friends_manager.has_ignore(source):
                 continue
 
-            member.session.request.sendall(packet)
+            member.session.enqueue_packet(packet)
 
     def send_minimap_ping(self, player_mgr, x, y):
         data = pack('<Q2f', player_mgr.guid, x, y)
@@ -266,7 +275,7 @@ class GroupManager(object):
         )
 
         packet = PacketWriter.get_packet(OpCode.SMSG_GROUP_INVITE, data)
-        target_player_mgr.session.request.sendall(packet)
+        target_player_mgr.session.enqueue_packet(packet)
 
         GroupManager.send_group_operation_result(player_mgr, PartyOperations.PARTY_OP_INVITE, target_player_mgr.player.name, PartyResults.ERR_PARTY_RESULT_OK)
 
@@ -281,4 +290,4 @@ class GroupManager(object):
         )
 
         packet = PacketWriter.get_packet(OpCode.SMSG_PARTY_COMMAND_RESULT, data)
-        player.session.request.sendall(packet)
+        player.session.enqueue_packet(packet)
@@ -2,11 +2,13 @@ from struct import pack
 
 from database.realm.RealmDatabaseManager import RealmDatabaseManager
 from database.world.WorldDatabaseManager import WorldDatabaseManager
+from game.world.managers.CharacterSaveManager import CharacterSaveManager
 from game.world.managers.GridManager import GridManager
 from game.world.managers.objects.item.ItemManager import ItemManager
 from game.world.managers.objects.item.ContainerManager import ContainerManager
 from network.packet.PacketWriter import PacketWriter, OpCode
 from network.packet.update.UpdatePacketFactory import UpdatePacketFactory
+from network.packet.update.UpdateBatch import UpdateBatch
 from utils.ConfigManager import config
 from utils.Logger import Logger
 from utils.constants.ItemCodes import InventoryTypes, InventorySlots, InventoryError
@@ -54,7 +56,7 @@ class InventoryManager(object):
                                                                             item_template.entry,
                                                                             item_template.name,
                                                                             item_template.display_id))
-                    RealmDatabaseManager.character_inventory_delete(item_instance)
+                    CharacterSaveManager.mark_deleted(item_instance)
                     continue
 
                 if item_template.inventory_type == InventoryTypes.BAG:
@@ -178,7 +180,7 @@ class InventoryManager(object):
                         self.add_item(item_template=item_template, count=count-diff, handle_error=False)
 
                     self.owner.send_update_self(force_inventory_update=True)
-                    RealmDatabaseManager.character_inventory_update_item(dest_item.item_instance)
+                    CharacterSaveManager.mark_dirty(dest_item.item_instance)
                     return True
                 else:
                     if handle_error:
@@ -197,7 +199,7 @@ class InventoryManager(object):
         if dest_container.is_backpack and \
                 (self.is_equipment_pos(dest_bag_slot, dest_slot) or self.is_bag_pos(dest_slot)):  # Added equipment or bag
             self.handle_equipment_change(generated_item)
-            RealmDatabaseManager.character_inventory_update_item(generated_item.item_instance)
+            CharacterSaveManager.mark_dirty(generated_item.item_instance)
         else:
             self.owner.send_update_self(force_inventory_update=True)
 
@@ -237,10 +239,10 @@ class InventoryManager(object):
                 # Update stack values
                 source_item.item_instance.stackcount -= diff
                 dest_item.item_instance.stackcount = dest_item.item_template.stackable
-                RealmDatabaseManager.character_inventory_update_item(source_item.item_instance)
+                CharacterSaveManager.mark_dirty(source_item.item_instance)
 
             self.owner.send_update_self(force_inventory_update=True)
-            RealmDatabaseManager.character_inventory_update_item(dest_item.item_instance)
+            CharacterSaveManager.mark_dirty(dest_item.item_instance)
             return
 
         # Remove source and dest item
@@ -252,11 +254,11 @@ class InventoryManager(object):
         # Register bags if source/dest are bag slots
         if dest_container.is_backpack and self.is_bag_pos(dest_slot):
             self.add_bag(dest_slot, source_item)
-            RealmDatabaseManager.character_inventory_update_container_contents(source_item)
+            CharacterSaveManager.mark_container_dirty(source_item)
 
         if dest_container.is_backpack and dest_item and self.is_bag_pos(source_slot):
             self.add_bag(source_slot, dest_item)
-            RealmDatabaseManager.character_inventory_update_container_contents(dest_item)
+            CharacterSaveManager.mark_container_dirty(dest_item)
 
         dest_container.set_item(source_item, dest_slot)
         source_item.item_instance.bag = dest_bag    # TODO These fields serve little purpose?
@@ -276,9 +278,9 @@ class InventoryManager(object):
             self.owner.send_update_self(force_inventory_update=True)
 
         # Finally, update items and client
-        RealmDatabaseManager.character_inventory_update_item(source_item.item_instance)
+        CharacterSaveManager.mark_dirty(source_item.item_instance)
         if dest_item:
-            RealmDatabaseManager.character_inventory_update_item(dest_item.item_instance)
+            CharacterSaveManager.mark_dirty(dest_item.item_instance)
 
     def get_item_count(self, entry):
         count = 0
@@ -318,7 +320,7 @@ class InventoryManager(object):
         target_container.remove_item_in_slot(target_slot)
 
         if clear_slot:
-            RealmDatabaseManager.character_inventory_delete(target_item.item_instance)
+            CharacterSaveManager.mark_deleted(target_item.item_instance)
 
         if target_container.is_backpack and \
                 self.is_bag_pos(target_slot) and self.get_container(target_slot):  # Equipped bags
@@ -360,7 +362,7 @@ class InventoryManager(object):
         return True
 
     def send_destroy_packet(self, slot, slot_list):
-        self.owner.session.request.sendall(slot_list[slot].get_destroy_packet())
+        self.owner.session.enqueue_packet(slot_list[slot].get_destroy_packet())
 
     def get_empty_slots(self):
         empty_slots = 0
@@ -624,7 +626,7 @@ class InventoryManager(object):
                 item_2.guid if item_2 else self.owner.guid,
                 0
             )
-        self.owner.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_INVENTORY_CHANGE_FAILURE, data))
+        self.owner.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_INVENTORY_CHANGE_FAILURE, data))
 
     def send_buy_error(self, error, entry, vendor_guid=0):
         data = pack(
@@ -633,7 +635,7 @@ class InventoryManager(object):
             entry,
             error
         )
-        self.owner.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_BUY_FAILED, data))
+        self.owner.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_BUY_FAILED, data))
 
     def send_sell_error(self, error, item_guid, vendor_guid=0):
         data = pack(
@@ -642,7 +644,7 @@ class InventoryManager(object):
             item_guid,
             error
         )
-        self.owner.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_SELL_ITEM, data))
+        self.owner.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_SELL_ITEM, data))
 
     def send_item_receive_message(self, guid, item_entry, bag_slot, looted=False, show_in_chat=True):
         if bag_slot == InventorySlots.SLOT_INBACKPACK:
@@ -651,7 +653,7 @@ class InventoryManager(object):
             '<Q2IBI',
             guid, not looted, show_in_chat, bag_slot, item_entry
         )
-        self.owner.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_ITEM_PUSH_RESULT, data))
+        self.owner.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_ITEM_PUSH_RESULT, data))
 
     def mark_as_removed(self, item):
         if item:
@@ -668,19 +670,34 @@ class InventoryManager(object):
         update_packet = UpdatePacketFactory.compress_if_needed(PacketWriter.get_packet(
             OpCode.SMSG_UPDATE_OBJECT, item.get_full_update_packet(is_self=False)))
         if is_self:
-            world_session.request.sendall(update_packet)
-            world_session.request.sendall(item.query_details())
+            world_session.enqueue_packet(update_packet)
+            world_session.enqueue_packet(item.query_details())
         else:
             GridManager.send_surrounding(update_packet, world_session.player_mgr, include_self=False)
             GridManager.send_surrounding(item.query_details(), world_session.player_mgr,
                                          include_self=False)
 
     def send_inventory_update(self, world_session, is_self=True):
+        items = []
         for container_slot, container in list(self.containers.items()):
             if not container:
                 continue
             if not container.is_backpack:
-                self.send_single_item_update(world_session, container, is_self)
+                items.append(container)
+            items.extend(list(container.sorted_slots.values()))
 
-            for slot, item in list(container.sorted_slots.items()):
-                self.send_single_item_update(world_session, item, is_self)
+        update_batch = UpdateBatch()
+        for item in items:
+            update_batch.add_create(item, is_self=False)
+
+        for update_packet in update_batch.get_packets():
+            if is_self:
+                world_session.enqueue_packet(update_packet)
+            else:
+                GridManager.send_surrounding(update_packet, world_session.player_mgr, include_self=False)
+
+        for item in items:
+            if is_self:
+                world_session.enqueue_packet(item.query_details())
+            else:
+                GridManager.send_surrounding(item.query_details(), world_session.player_mgr, include_self=False)
@@ -1,9 +1,13 @@
 import time
-from struct import unpack
+from struct import pack, unpack
 from math import pi
 
+from game.world.WorldSessionStateHandler import WorldSessionStateHandler
+from game.world.WorldTimers import WORLD_TIMERS
+from game.world.managers.CharacterSaveManager import CharacterSaveManager
 from game.world.managers.GridManager import GridManager
 from game.world.managers.abstractions.Vector import Vector
+from game.world.managers.objects.ObjectManager import ObjectManager
 from game.world.managers.objects.UnitManager import UnitManager
 from game.world.managers.objects.player.SkillManager import SkillManager
 from game.world.managers.objects.player.SpellManager import SpellManager
@@ -19,7 +23,7 @@ from utils import Formulas
 from utils.constants.ObjectCodes import ObjectTypes, ObjectTypeIds, PlayerFlags, WhoPartyStatus, HighGuid, \
     AttackTypes, MoveFlags
 from utils.constants.UnitCodes import Classes, PowerTypes, Races, Genders, UnitFlags, Teams, StandState
-from network.packet.update.UpdatePacketFactory import UpdatePacketFactory
+from network.packet.update.UpdateBatch import UpdateBatch
 from utils.constants.UpdateFields import *
 from database.dbc.DbcDatabaseManager import *
 from utils.constants.ObjectCodes import ChatFlags, LootTypes
@@ -52,7 +56,7 @@ class PlayerManager(UnitManager):
 
         self.session = session
         self.is_teleporting = False
-        self.objects_in_range = dict()
+        self.objects_in_range = set()
 
         self.player = player
         self.online = online
@@ -75,7 +79,7 @@ class PlayerManager(UnitManager):
         self.team = PlayerManager.get_team_for_race(self.race_mask)
         self.trade_data = None
         self.last_regen = 0
-        self.spirit_release_timer = 0
+        self.spirit_release_timer = None
         self.dirty_inventory = False
         self.pending_taxi_destination = None
 
@@ -202,9 +206,14 @@ class PlayerManager(UnitManager):
 
     def complete_login(self):
         self.online = True
+        WorldSessionStateHandler.add_player(self)
+        CharacterSaveManager.register(self)
+        if not self.is_alive:
+            self.schedule_spirit_release()
 
+        # Surrounding players get our create through grid interest updates
         GridManager.update_object(self)
-        self.send_update_surrounding(self.generate_proper_update_packet(create=True), include_self=False, create=True)
+        self.session.enqueue_packet(NameQueryHandler.get_query_details(self.player))
 
     def logout(self):
         # TODO: Temp hackfix until groups are saved in db
@@ -220,7 +229,12 @@ class PlayerManager(UnitManager):
 
         self.friends_manager.send_offline_notification()
         self.online = False
+        WorldSessionStateHandler.remove_player(self)
+        CharacterSaveManager.unregister(self)
+        WORLD_TIMERS.cancel(self.spirit_release_timer)
+        self.spirit_release_timer = None
         self.session.save_character()
+        CharacterSaveManager.flush_rows()
         GridManager.remove_object(self)
         self.session.player_mgr = None
         self.session = None
@@ -252,50 +266,53 @@ class PlayerManager(UnitManager):
             )
         return PacketWriter.get_packet(OpCode.SMSG_BINDPOINTUPDATE, data)
 
+    # Full resync of what this player sees, only needed when entering the world. Later changes arrive incrementally
+    # through add_visible_objects() and remove_visible_objects() as objects enter and leave the surrounding cells.
     def update_surrounding_on_me(self):
-        players, creatures, gobjects = GridManager.get_surrounding_objects(self, [ObjectTypes.TYPE_PLAYER,
-                                                                                  ObjectTypes.TYPE_UNIT,
-                                                                                  ObjectTypes.TYPE_GAMEOBJECT])
-
-        # At this point, all objects aren't synced unless proven otherwise
-        for guid, object_info in list(self.objects_in_range.items()):
-            self.objects_in_range[guid]['synced'] = False
-
-        for guid, player in players.items():
-            if self.guid != guid:
-                if guid not in self.objects_in_range:
-                    update_packet = player.generate_proper_update_packet(create=True)
-                    self.session.request.sendall(update_packet)
-                    self.session.request.sendall(NameQueryHandler.get_query_details(player.player))
-                self.objects_in_range[guid] = {'object': player, 'synced': True}
-
-        for guid, creature in creatures.items():
-            if creature.is_spawned:
-                if guid not in self.objects_in_range:
-                    update_packet = UpdatePacketFactory.compress_if_needed(
-                        PacketWriter.get_packet(OpCode.SMSG_UPDATE_OBJECT,
-                                                creature.get_full_update_packet(is_self=False)))
-                    self.session.request.sendall(update_packet)
-                    self.session.request.sendall(creature.query_details())
-            self.objects_in_range[guid] = {'object': creature, 'synced': True}
-
-        for guid, gobject in gobjects.items():
-            if guid not in self.objects_in_range:
-                update_packet = UpdatePacketFactory.compress_if_needed(
-                    PacketWriter.get_packet(OpCode.SMSG_UPDATE_OBJECT,
-                                            gobject.get_full_update_packet(is_self=False)))
-                self.session.request.sendall(update_packet)
-                self.session.request.sendall(gobject.query_details())
-            self.objects_in_range[guid] = {'object': gobject, 'synced': True}
-
-        for guid, object_info in list(self.objects_in_range.items()):
-            if not object_info['synced']:
-                self.destroy_near_object(guid, skip_check=True)
+        surrounding = list(GridManager.iter_surrounding_objects(self, (ObjectTypes.TYPE_PLAYER,
+                                                                       ObjectTypes.TYPE_UNIT,
+                                                                       ObjectTypes.TYPE_GAMEOBJECT), snapshot=True))
+        surrounding_guids = {world_obj.guid for world_obj in surrounding}
+
+        self.remove_visible_objects([guid for guid in self.objects_in_range if guid not in surrounding_guids])
+        self.add_visible_objects(surrounding)
+
+    def add_visible_objects(self, world_objects):
+        # Objects entering range are sent together, in as few update packets as possible
+        update_batch = UpdateBatch()
+        new_players = []
+        new_objects = []
+
+        for world_object in world_objects:
+            guid = world_object.guid
+            if guid == self.guid or guid in self.objects_in_range:
+                continue
+            self.objects_in_range.add(guid)
+
+            object_type = world_object.get_type()
+            if object_type == ObjectTypes.TYPE_PLAYER:
+                update_batch.add_create(world_object, is_self=False)
+                new_players.append(world_object)
+            # Despawned creatures are still tracked, their create is broadcast on respawn
+            elif object_type != ObjectTypes.TYPE_UNIT or world_object.is_spawned:
+                update_batch.add_transaction(world_object.get_cached_create_data())
+                new_objects.append(world_object)
+
+        for update_packet in update_batch.get_packets():
+            self.session.enqueue_packet(update_packet)
+        for player in new_players:
+            self.session.enqueue_packet(NameQueryHandler.get_query_details(player.player))
+        for world_object in new_objects:
+            self.session.enqueue_packet(world_object.query_details())
+
+    def remove_visible_objects(self, guids):
+        for guid in guids:
+            self.destroy_near_object(guid)
 
     def destroy_near_object(self, guid, skip_check=False):
         if skip_check or guid in self.objects_in_range:
-            self.session.request.sendall(self.objects_in_range[guid]['object'].get_destroy_packet())
-            del self.objects_in_range[guid]
+            self.session.enqueue_packet(ObjectManager.get_destroy_packet_for(guid))
+            self.objects_in_range.discard(guid)
             return True
         return False
 
@@ -326,13 +343,16 @@ class PlayerManager(UnitManager):
 
         self.is_teleporting = True
 
-        for guid, player in list(GridManager.get_surrounding_players(self).items()):
-            if self.guid == guid:
+        for player in GridManager.iter_surrounding_players(self, snapshot=True):
+            if self.guid == player.guid:
                 continue
 
             # Always make sure self is destroyed for others
             if not player.destroy_near_object(self.guid):
-                player.session.request.sendall(self.get_destroy_packet())
+                player.session.enqueue_packet(self.get_destroy_packet())
+
+        # Leave the grid until the client acknowledges the teleport, entering it again resyncs everything around
+        GridManager.remove_object(self)
 
         # Same map and not inside instance
         if self.map_ == map_ and self.map_ <= 1:
@@ -350,10 +370,12 @@ class PlayerManager(UnitManager):
                 0,  # ?
                 0  # MovementFlags
             )
-            self.session.request.sendall(PacketWriter.get_packet(OpCode.MSG_MOVE_TELEPORT_ACK, data))
+            self.session.enqueue_packet(PacketWriter.get_packet(OpCode.MSG_MOVE_TELEPORT_ACK, data))
         # Loading screen
         else:
-            self.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_TRANSFER_PENDING))
+            self.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_TRANSFER_PENDING))
+            # The client drops every object while loading the new world
+            self.objects_in_range.clear()
 
             data = pack(
                 '<B4f',
@@ -364,7 +386,7 @@ class PlayerManager(UnitManager):
                 location.o
             )
 
-            self.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_NEW_WORLD, data))
+            self.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_NEW_WORLD, data))
 
         self.map_ = map_
         self.location.x = location.x
@@ -404,7 +426,7 @@ class PlayerManager(UnitManager):
             speed = 56  # Max speed without glitches
         self.running_speed = speed
         data = pack('<f', speed)
-        self.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_FORCE_SPEED_CHANGE, data))
+        self.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_FORCE_SPEED_CHANGE, data))
 
         GridManager.send_surrounding(PacketWriter.get_packet(OpCode.SMSG_UPDATE_OBJECT,
                                                              self.get_movement_update_packet()), self)
@@ -416,7 +438,7 @@ class PlayerManager(UnitManager):
             swim_speed = 56  # Max possible swim speed
         self.swim_speed = swim_speed
         data = pack('<f', swim_speed)
-        self.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_FORCE_SWIM_SPEED_CHANGE, data))
+        self.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_FORCE_SWIM_SPEED_CHANGE, data))
 
         GridManager.send_surrounding(PacketWriter.get_packet(OpCode.SMSG_UPDATE_OBJECT,
                                                              self.get_movement_update_packet()), self)
@@ -428,7 +450,7 @@ class PlayerManager(UnitManager):
             walk_speed = 56  # Max speed without glitches
         self.walk_speed = walk_speed
         data = pack('<f', walk_speed)
-        self.session.request.sendall(PacketWriter.get_packet(OpCode.MSG_MOVE_SET_WALK_SPEED, data))
+        self.session.enqueue_packet(PacketWriter.get_packet(OpCode.MSG_MOVE_SET_WALK_SPEED, data))
 
         GridManager.send_surrounding(PacketWriter.get_packet(OpCode.SMSG_UPDATE_OBJECT,
                                                              self.get_movement_update_packet()), self)
@@ -439,7 +461,7 @@ class PlayerManager(UnitManager):
         self.turn_rate = turn_speed
         data = pack('<f', turn_speed)
         # TODO NOT WORKING
-        self.session.request.sendall(PacketWriter.get_packet(OpCode.MSG_MOVE_SET_TURN_RATE_CHEAT, data))
+        self.session.enqueue_packet(PacketWriter.get_packet(OpCode.MSG_MOVE_SET_TURN_RATE_CHEAT, data))
 
         GridManager.send_surrounding(PacketWriter.get_packet(OpCode.SMSG_UPDATE_OBJECT,
                                                              self.get_movement_update_packet()), self)
@@ -451,9 +473,9 @@ class PlayerManager(UnitManager):
                 if self.group_manager:
                     self.group_manager.reward_group_money(self, enemy)
                 else:
-                    self.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_LOOT_CLEAR_MONEY))
+                    self.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_LOOT_CLEAR_MONEY))
                     data = pack('<I', enemy.loot_manager.current_money)
-                    self.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_LOOT_MONEY_NOTIFY, data))
+                    self.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_LOOT_MONEY_NOTIFY, data))
                     self.mod_money(enemy.loot_manager.current_money)
                     enemy.loot_manager.clear_money()
 
@@ -481,7 +503,7 @@ class PlayerManager(UnitManager):
         self.set_uint32(UnitFields.UNIT_FIELD_FLAGS, self.unit_flags)
 
         data = pack('<QB', guid, 1)  # Must be 1 otherwise client keeps the loot window open
-        self.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_LOOT_RELEASE_RESPONSE, data))
+        self.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_LOOT_RELEASE_RESPONSE, data))
 
         # If this release comes from the loot owner, set killed_by to None to allow FFA loot.
         enemy = GridManager.get_surrounding_unit_by_guid(self, guid, include_players=False)
@@ -509,7 +531,7 @@ class PlayerManager(UnitManager):
             for loot in victim.loot_manager.current_loot:
                 if loot:
                     # Send item query information
-                    self.session.request.sendall(loot.item.query_details())
+                    self.session.enqueue_packet(loot.item.query_details())
 
                     data += pack('<B3I',
                                  slot,
@@ -520,7 +542,7 @@ class PlayerManager(UnitManager):
                 slot += 1
 
         packet = PacketWriter.get_packet(OpCode.SMSG_LOOT_RESPONSE, data)
-        self.session.request.sendall(packet)
+        self.session.enqueue_packet(packet)
 
         return loot_type != LootTypes.LOOT_TYPE_NOTALLOWED
 
@@ -551,7 +573,7 @@ class PlayerManager(UnitManager):
             new_xp += amount
             data += pack('<QI', self.guid, amount)
 
-        self.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_LOG_XPGAIN, data))
+        self.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_LOG_XPGAIN, data))
 
         if new_xp >= self.next_level_xp:  # Level up!
             self.xp = (new_xp - self.next_level_xp)  # Set the overload xp as current
@@ -586,7 +608,7 @@ class PlayerManager(UnitManager):
                                 hp_diff,
                                 mana_diff if self.power_type == PowerTypes.TYPE_MANA else 0
                                 )
-                    self.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_LEVELUP_INFO, data))
+                    self.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_LEVELUP_INFO, data))
 
                     # Add Talent and Skill points
                     self.add_talent_points(Formulas.PlayerFormulas.talent_points_gain_per_level(self.level))
@@ -943,7 +965,7 @@ class PlayerManager(UnitManager):
 
     def _send_attack_swing_error(self, victim, opcode):
         data = pack('<2Q', self.guid, victim.guid if victim else 0)
-        self.session.request.sendall(PacketWriter.get_packet(opcode, data))
+        self.session.enqueue_packet(PacketWriter.get_packet(opcode, data))
 
     # override
     def send_attack_swing_not_in_range(self, victim):
@@ -1011,18 +1033,18 @@ class PlayerManager(UnitManager):
             self.attack_update(elapsed)
             # Waypoints (mostly flying paths) update
             self.movement_manager.update_pending_waypoints(elapsed)
-
-            # Release spirit timer
-            if not self.is_alive:
-                if self.spirit_release_timer < 300:  # 5 min
-                    self.spirit_release_timer += elapsed
-                else:
-                    self.repop()
         self.last_tick = now
 
         if self.dirty:
-            self.send_update_self(reset_fields=False)
-            self.send_update_surrounding(self.generate_proper_update_packet())
+            if self.dirty_inventory:
+                self.inventory.send_inventory_update(self.session, is_self=True)
+                self.inventory.send_inventory_update(self.session, is_self=False)
+                self.inventory.build_update()
+
+            # Partial updates are identical for self and observers, serialize once and share the same packet
+            update_packet = self.generate_proper_update_packet()
+            self.session.enqueue_packet(update_packet)
+            GridManager.send_surrounding(update_packet, self, include_self=False)
             GridManager.update_object(self)
             self.reset_fields()
 
@@ -1036,7 +1058,7 @@ class PlayerManager(UnitManager):
         if not update_packet:
             update_packet = self.generate_proper_update_packet(is_self=True, create=create)
 
-        self.session.request.sendall(update_packet)
+        self.session.enqueue_packet(update_packet)
 
         if reset_fields:
             self.reset_fields()
@@ -1061,10 +1083,10 @@ class PlayerManager(UnitManager):
 
         if killer and killer.get_type() == ObjectTypes.TYPE_PLAYER:
             death_notify_packet = PacketWriter.get_packet(OpCode.SMSG_DEATH_NOTIFY, pack('<Q', killer.guid))
-            self.session.request.sendall(death_notify_packet)
+            self.session.enqueue_packet(death_notify_packet)
 
         TradeManager.cancel_trade(self)
-        self.spirit_release_timer = 0
+        self.schedule_spirit_release()
 
         self.set_dirty()
 
@@ -1082,7 +1104,8 @@ class PlayerManager(UnitManager):
         if self.power_type == PowerTypes.TYPE_ENERGY:
             self.set_energy(int(self.max_power_4 / 2))
 
-        self.spirit_release_timer = 0
+        WORLD_TIMERS.cancel(self.spirit_release_timer)
+        self.spirit_release_timer = None
 
         if force_update:
             self.set_dirty()
@@ -1091,9 +1114,25 @@ class PlayerManager(UnitManager):
         self.respawn(force_update=False)
         self.teleport_deathbind()
 
+    # Spirit is released automatically after 5 minutes.
+    def schedule_spirit_release(self):
+        WORLD_TIMERS.cancel(self.spirit_release_timer)
+        self.spirit_release_timer = WORLD_TIMERS.schedule(300, self.on_spirit_release)
+
+    def on_spirit_release(self):
+        self.spirit_release_timer = None
+        if not self.online or self.is_alive:
+            return
+
+        # Wait until the teleport is done
+        if self.is_teleporting:
+            self.spirit_release_timer = WORLD_TIMERS.schedule(1, self.on_spirit_release)
+            return
+
+        self.repop()
+
     # override
     def on_grid_change(self):
-        self.update_surrounding_on_me()
         self.quest_manager.update_surrounding_quest_status()
 
     # override
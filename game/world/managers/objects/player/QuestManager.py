@@ -216,14 +216,14 @@ class QuestManager(object):
         return req_creature_or_go_count_list
 
     def update_surrounding_quest_status(self):
-        for guid, unit in list(GridManager.get_surrounding_units(self.player_mgr).items()):
+        for unit in GridManager.iter_surrounding_units(self.player_mgr, snapshot=True):
             if WorldDatabaseManager.creature_involved_quest_get_by_entry(unit.entry) or WorldDatabaseManager.creature_quest_get_by_entry(unit.entry):
                 quest_status = self.get_dialog_status(unit)
-                self.send_quest_giver_status(guid, quest_status)
+                self.send_quest_giver_status(unit.guid, quest_status)
 
     def send_cant_take_quest_response(self, reason_code):
         data = pack('<I', reason_code)
-        self.player_mgr.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_QUESTGIVER_QUEST_INVALID, data))
+        self.player_mgr.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_QUESTGIVER_QUEST_INVALID, data))
 
     def send_quest_giver_status(self, quest_giver_guid, quest_status):
         data = pack(
@@ -231,7 +231,7 @@ class QuestManager(object):
             quest_giver_guid if quest_giver_guid > 0 else self.player_mgr.guid,
             quest_status
         )
-        self.player_mgr.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_QUESTGIVER_STATUS, data))
+        self.player_mgr.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_QUESTGIVER_STATUS, data))
 
     def send_quest_giver_quest_list(self, message, quest_giver_guid, quests):
         message_bytes = PacketWriter.string_to_bytes(message)
@@ -254,7 +254,7 @@ class QuestManager(object):
                 quest_title
             )
 
-        self.player_mgr.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_QUESTGIVER_QUEST_LIST, data))
+        self.player_mgr.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_QUESTGIVER_QUEST_LIST, data))
 
     def send_quest_giver_quest_details(self, quest, quest_giver_guid, activate_accept):
         # Quest information
@@ -323,7 +323,7 @@ class QuestManager(object):
                 req_creature_or_go_count_list[index]
             )
 
-        self.player_mgr.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_QUESTGIVER_QUEST_DETAILS, data))
+        self.player_mgr.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_QUESTGIVER_QUEST_DETAILS, data))
 
 class QuestMenu:
     class QuestMenuItem(NamedTuple):
@@ -6,6 +6,7 @@ from database.dbc.DbcDatabaseManager import DbcDatabaseManager
 from database.realm.RealmDatabaseManager import RealmDatabaseManager
 from database.realm.RealmModels import CharacterSkill
 from database.world.WorldDatabaseManager import WorldDatabaseManager
+from game.world.managers.CharacterSaveManager import CharacterSaveManager
 from utils.constants.ItemCodes import ItemClasses, ItemSubClasses
 from utils.constants.ObjectCodes import SkillCategories, Languages
 from utils.constants.UnitCodes import Classes
@@ -258,7 +259,7 @@ class SkillManager(object):
         if max_value > 0:
             skill.max = max_value
 
-        RealmDatabaseManager.character_update_skill(skill)
+        CharacterSaveManager.mark_dirty(skill)
 
     def update_skills_max_value(self):
         for skill_id, skill in self.skills.items():
@@ -61,4 +61,4 @@ class TalentManager(object):
             talent_count += 1
 
         data = pack('<Q2I', self.player_mgr.guid, TrainerTypes.TRAINER_TYPE_TALENTS, talent_count) + talent_bytes
-        self.player_mgr.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_TRAINER_LIST, data))
+        self.player_mgr.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_TRAINER_LIST, data))
@@ -228,17 +228,72 @@ HANDLER_DEFINITIONS = {
 }
 
 
+# Opcodes that can be handled before a character is logged in.
+NO_PLAYER_OPCODES = {
+    OpCode.CMSG_AUTH_SESSION,
+    OpCode.CMSG_PING,
+    OpCode.CMSG_CHAR_ENUM,
+    OpCode.CMSG_CHAR_CREATE,
+    OpCode.CMSG_CHAR_DELETE,
+    OpCode.CMSG_PLAYER_LOGIN,
+}
+
+# Movement is ignored until the client acknowledges a pending teleport.
+MOVEMENT_OPCODES = {opcode for opcode, handler in HANDLER_DEFINITIONS.items()
+                    if handler == MovementHandler.handle_movement_status}
+
+# Max payload size per opcode, anything bigger is dropped before reaching the handler. 0 means no limit.
+MAX_PAYLOAD_SIZES = {
+    OpCode.CMSG_PING: 16,
+    **{opcode: 128 for opcode in MOVEMENT_OPCODES},
+}
+
+
+class OpcodeHandler(object):
+    __slots__ = ('opcode', 'handler', 'requires_player', 'allowed_while_teleporting', 'max_size')
+
+    def __init__(self, opcode, handler, requires_player=True, allowed_while_teleporting=True, max_size=0):
+        self.opcode = opcode
+        self.handler = handler
+        self.requires_player = requires_player
+        self.allowed_while_teleporting = allowed_while_teleporting
+        self.max_size = max_size
+
+    def can_handle(self, world_session, reader):
+        if self.max_size and reader.size > self.max_size:
+            Logger.warning('[%s] Dropping %s, payload of %u bytes exceeds %u.' % (
+                world_session.client_address[0], self.opcode.name, reader.size, self.max_size))
+            return False
+
+        player_mgr = world_session.player_mgr
+        if not player_mgr:
+            return not self.requires_player
+
+        return self.allowed_while_teleporting or not player_mgr.is_teleporting
+
+
+# Indexed by raw opcode value, built once so that dispatching a packet is a single list lookup.
+HANDLER_TABLE = [None] * OpCode.NUM_MSG_TYPES
+for _opcode, _handler in HANDLER_DEFINITIONS.items():
+    HANDLER_TABLE[_opcode] = OpcodeHandler(_opcode, _handler,
+                                           requires_player=_opcode not in NO_PLAYER_OPCODES,
+                                           allowed_while_teleporting=_opcode not in MOVEMENT_OPCODES,
+                                           max_size=MAX_PAYLOAD_SIZES.get(_opcode, 0))
+
+
 class Definitions(object):
 
     @staticmethod
     def get_handler_from_packet(world_session, opcode):
+        if 0 <= opcode < OpCode.NUM_MSG_TYPES:
+            opcode_handler = HANDLER_TABLE[opcode]
+            if opcode_handler:
+                return opcode_handler, 1
+
+        # Slow path, only for opcodes without a handler
         try:
-            opcode_name = OpCode(opcode)
-            if opcode_name in HANDLER_DEFINITIONS:
-                return HANDLER_DEFINITIONS.get(OpCode(opcode)), 1
-            else:
-                Logger.warning('[%s] Received %s OpCode but is not handled.' % (world_session.client_address[0],
-                                                                                opcode_name))
+            Logger.warning('[%s] Received %s OpCode but is not handled.' % (world_session.client_address[0],
+                                                                            OpCode(opcode)))
         except ValueError:
             return None, -1
         return None, 0
@@ -0,0 +1,86 @@
+import threading
+from bisect import bisect_left
+from time import strftime
+
+from utils.ConfigManager import config
+from utils.Logger import Logger
+from utils.constants.OpCodes import OpCode
+
+# Latency bucket upper bounds in microseconds (1us to ~1s, doubling), last bucket catches everything above.
+LATENCY_BUCKETS = [1 << i for i in range(21)]
+
+
+class OpcodeMetrics(object):
+    __slots__ = ('calls', 'bytes_in', 'total_us', 'max_us', 'histogram')
+
+    def __init__(self):
+        self.calls = 0
+        self.bytes_in = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+        self.histogram = [0] * (len(LATENCY_BUCKETS) + 1)
+
+    def percentile(self, pct):
+        if not self.calls:
+            return 0
+        threshold = self.calls * pct / 100.0
+        seen = 0
+        for bucket, count in enumerate(self.histogram):
+            seen += count
+            if seen >= threshold:
+                return min(LATENCY_BUCKETS[bucket], self.max_us) if bucket < len(LATENCY_BUCKETS) else self.max_us
+        return self.max_us
+
+
+class HandlerMetrics(object):
+    ENABLED = config.Server.Settings.handler_metrics
+    METRICS = {}
+    LOCK = threading.Lock()
+
+    @staticmethod
+    def record(opcode, size, elapsed):
+        elapsed_us = elapsed * 1000000.0
+        with HandlerMetrics.LOCK:
+            metrics = HandlerMetrics.METRICS.get(opcode)
+            if not metrics:
+                metrics = OpcodeMetrics()
+                HandlerMetrics.METRICS[opcode] = metrics
+
+            metrics.calls += 1
+            metrics.bytes_in += size
+            metrics.total_us += elapsed_us
+            if elapsed_us > metrics.max_us:
+                metrics.max_us = elapsed_us
+            metrics.histogram[bisect_left(LATENCY_BUCKETS, elapsed_us)] += 1
+
+    @staticmethod
+    def reset():
+        with HandlerMetrics.LOCK:
+            HandlerMetrics.METRICS = {}
+
+    @staticmethod
+    def get_report(limit=0):
+        with HandlerMetrics.LOCK:
+            entries = sorted(HandlerMetrics.METRICS.items(), key=lambda entry: entry[1].total_us, reverse=True)
+            lines = []
+            for opcode, metrics in entries[:limit] if limit else entries:
+                lines.append('%s: calls %u, bytes %u, total %.1fms, p50 %uus, p99 %uus, max %uus' % (
+                    OpCode(opcode).name, metrics.calls, metrics.bytes_in, metrics.total_us / 1000.0,
+                    metrics.percentile(50), metrics.percentile(99), metrics.max_us))
+        return lines
+
+    # Appends the report to handler_metrics_file, returns whether anything was written.
+    @staticmethod
+    def dump():
+        lines = HandlerMetrics.get_report()
+        if not lines:
+            return False
+
+        try:
+            with open(config.Server.Settings.handler_metrics_file, 'a') as metrics_file:
+                metrics_file.write('[%s]\n%s\n\n' % (strftime('%Y-%m-%d %H:%M:%S'), '\n'.join(lines)))
+        except OSError as e:
+            Logger.warning('Unable to write handler metrics: %s' % e)
+            return False
+        return True
+
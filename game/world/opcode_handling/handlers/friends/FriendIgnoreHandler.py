@@ -1,3 +1,4 @@
+from struct import pack
 from network.packet.PacketReader import *
 from network.packet.PacketWriter import *
 from utils.constants.ObjectCodes import FriendResults
@@ -23,6 +24,6 @@ class FriendIgnoreHandler(object):
             world_session.player_mgr.friends_manager.add_ignore(target_player_mgr)
         else:
             data = pack('<B', friend_result)
-            world_session.player_mgr.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_FRIEND_STATUS, data))
+            world_session.player_mgr.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_FRIEND_STATUS, data))
 
         return 0
@@ -1,3 +1,4 @@
+from struct import unpack
 from network.packet.PacketReader import *
 from game.world.managers.objects.player.GroupManager import GroupManager
 from game.world.WorldSessionStateHandler import WorldSessionStateHandler
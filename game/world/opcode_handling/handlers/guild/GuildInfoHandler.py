@@ -1,3 +1,4 @@
+from struct import pack
 from network.packet.PacketWriter import *
 from game.world.managers.objects.player.guild.GuildManager import GuildManager
 from utils.constants.ObjectCodes import GuildCommandResults, GuildTypeCommand
@@ -23,6 +24,6 @@ class GuildInfoHandler(object):
             # TODO: Handle proper data and nº of accounts
             # Day, Month, Years, Players, Nº Accounts
             data += pack('<5I', 0, 0, 0, len(player.guild_manager.members), 0)
-            player.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_GUILD_INFO, data))
+            player.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_GUILD_INFO, data))
 
         return 0
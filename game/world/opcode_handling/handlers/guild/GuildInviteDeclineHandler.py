@@ -1,3 +1,4 @@
+from struct import pack
 from network.packet.PacketWriter import *
 from game.world.managers.objects.player.guild.GuildManager import GuildManager
 from utils.constants.ObjectCodes import GuildCommandResults, GuildTypeCommand
@@ -19,6 +20,6 @@ class GuildInviteDeclineHandler(object):
                 inviter_name_bytes,
             )
 
-            inviter.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_GUILD_DECLINE, data))
+            inviter.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_GUILD_DECLINE, data))
 
         return 0
\ No newline at end of file
@@ -1,3 +1,4 @@
+from struct import pack
 from network.packet.PacketReader import *
 from game.world.WorldSessionStateHandler import WorldSessionStateHandler
 from network.packet.PacketWriter import *
@@ -45,6 +46,6 @@ class GuildInviteHandler(object):
                     guild_name_bytes,
                 )
 
-                target_player_mgr.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_GUILD_INVITE, data))
+                target_player_mgr.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_GUILD_INVITE, data))
 
         return 0
@@ -1,3 +1,4 @@
+from struct import pack, unpack
 from network.packet.PacketReader import *
 from network.packet.PacketWriter import *
 from game.world.managers.objects.player.guild.GuildManager import GuildManager
@@ -23,6 +24,6 @@ class GuildQueryHandler(object):
 
             # TODO: EmblemStyle, EmblemColor, BorderStyle, BorderColor, BGColor
             data += pack('<5i', -1, -1, -1, -1, -1)
-            player.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_GUILD_QUERY_RESPONSE, data))
+            player.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_GUILD_QUERY_RESPONSE, data))
 
         return 0
@@ -1,3 +1,4 @@
+from struct import pack
 from network.packet.PacketWriter import *
 from utils.constants.UnitCodes import Classes, Races
 from database.world.WorldDatabaseManager import WorldDatabaseManager
@@ -35,6 +36,6 @@ class GuildRosterHandler(object):
                     member.guild_manager.get_guild_rank(member)
                 )
 
-            player.session.request.sendall(PacketWriter.get_packet(OpCode.SMSG_GUILD_ROSTER, data))
+            player.session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_GUILD_ROSTER, data))
 
         return 0
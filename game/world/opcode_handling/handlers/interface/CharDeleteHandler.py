@@ -19,6 +19,6 @@ class CharDeleteHandler(object):
             res = CharDelete.CHAR_DELETE_FAILED
             Logger.error('Error deleting character with guid %s.' % guid)
 
-        socket.sendall(PacketWriter.get_packet(OpCode.SMSG_CHAR_DELETE, pack('<B', res)))
+        world_session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_CHAR_DELETE, pack('<B', res)))
 
         return 0
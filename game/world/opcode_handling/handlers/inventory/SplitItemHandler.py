@@ -1,5 +1,5 @@
 from struct import unpack
-from database.realm.RealmDatabaseManager import RealmDatabaseManager
+from game.world.managers.CharacterSaveManager import CharacterSaveManager
 from utils.constants.ItemCodes import InventorySlots, InventoryError
 
 
@@ -24,6 +24,6 @@ class SplitItemHandler(object):
                                               item_template=source_item.item_template, count=count):
                 return 0
             source_item.item_instance.stackcount -= count
-            RealmDatabaseManager.character_inventory_update_item(source_item.item_instance)
+            CharacterSaveManager.mark_dirty(source_item.item_instance)
             inventory.owner.send_update_self(force_inventory_update=True)
         return 0
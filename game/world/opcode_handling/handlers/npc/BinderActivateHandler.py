@@ -1,7 +1,7 @@
 from struct import unpack, pack
 
-from database.realm.RealmDatabaseManager import RealmDatabaseManager
 from database.realm.RealmModels import CharacterDeathbind
+from game.world.managers.CharacterSaveManager import CharacterSaveManager
 from network.packet.PacketWriter import PacketWriter, OpCode
 from utils.constants.ObjectCodes import HighGuid
 
@@ -19,10 +19,10 @@ class BinderActivateHandler(object):
                 world_session.player_mgr.deathbind.deathbind_position_x = world_session.player_mgr.location.x
                 world_session.player_mgr.deathbind.deathbind_position_y = world_session.player_mgr.location.y
                 world_session.player_mgr.deathbind.deathbind_position_z = world_session.player_mgr.location.z
-                RealmDatabaseManager.character_update_deathbind(world_session.player_mgr.deathbind)
-                socket.sendall(world_session.player_mgr.get_deathbind_packet())
+                CharacterSaveManager.mark_dirty(world_session.player_mgr.deathbind)
+                world_session.enqueue_packet(world_session.player_mgr.get_deathbind_packet())
 
                 data = pack('<Q', binder_guid)
-                socket.sendall(PacketWriter.get_packet(OpCode.SMSG_PLAYERBOUND, data))
+                world_session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_PLAYERBOUND, data))
 
         return 0
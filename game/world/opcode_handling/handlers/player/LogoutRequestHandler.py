@@ -7,7 +7,7 @@ class LogoutRequestHandler(object):
 
     @staticmethod
     def handle(world_session, socket, reader):
-        socket.sendall(PacketWriter.get_packet(OpCode.SMSG_LOGOUT_COMPLETE))
+        world_session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_LOGOUT_COMPLETE))
         world_session.player_mgr.logout()
 
         return 0
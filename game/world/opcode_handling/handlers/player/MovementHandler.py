@@ -1,4 +1,4 @@
-from struct import pack, unpack, error, calcsize
+from struct import Struct, error
 
 from game.world.managers.GridManager import GridManager
 from game.world.managers.abstractions.Vector import Vector
@@ -9,16 +9,21 @@ from utils.constants.OpCodes import OpCode
 from utils.Logger import Logger
 from utils.constants.UnitCodes import StandState
 
+# Transport guid, transport x, y, z, o, x, y, z, o, pitch, flags
+MOVEMENT_STRUCT = Struct('<Q9fI')
+GUID_STRUCT = Struct('<Q')
+
 
 class MovementHandler(object):
 
     @staticmethod
     def handle_movement_status(world_session, socket, reader):
         # Avoid handling malformed movement packets, or handling them while no player or player teleporting
-        if world_session.player_mgr and not world_session.player_mgr.is_teleporting and len(reader.data) >= 48:
+        if world_session.player_mgr and not world_session.player_mgr.is_teleporting and \
+                reader.remaining() >= MOVEMENT_STRUCT.size:
             try:
                 transport_guid, transport_x, transport_y, transport_z, transport_o, x, y, z, o, pitch, flags = \
-                    unpack('<Q9fI', reader.data[:48])
+                    reader.read_struct(MOVEMENT_STRUCT)
 
                 # Hacky way to prevent random teleports when colliding with elevators
                 # Also acts as a rudimentary teleport cheat detection
@@ -48,13 +53,11 @@ class MovementHandler(object):
 
                 if flags & MoveFlags.MOVEFLAG_SPLINE_MOVER:
                     world_session.player_mgr.movement_spline = MovementManager.MovementSpline.from_bytes(
-                        reader.data[48:])
+                        reader.read_bytes())
 
-                movement_data = pack('<Q%us' % len(reader.data),
-                                     world_session.player_mgr.guid,
-                                     reader.data)
+                movement_data = GUID_STRUCT.pack(world_session.player_mgr.guid) + reader.payload()
 
-                GridManager.send_surrounding(PacketWriter.get_packet(OpCode(reader.opcode), movement_data),
+                GridManager.send_surrounding(PacketWriter.get_packet(reader.opcode, movement_data),
                                              world_session.player_mgr, include_self=False)
                 GridManager.update_object(world_session.player_mgr)
                 world_session.player_mgr.sync_player()
@@ -66,7 +69,7 @@ class MovementHandler(object):
                 #        reader.opcode == OpCode.MSG_MOVE_STOP_STRAFE or \
                 #        reader.opcode == OpCode.MSG_MOVE_STOP_TURN:
                 #    data = pack('<2QI', world_session.player_mgr.guid, 0, 0)
-                #    socket.sendall(PacketWriter.get_packet(OpCode.SMSG_ATTACKSTOP, data))
+                #    world_session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_ATTACKSTOP, data))
 
                 # Get up if you jump while not standing
                 if reader.opcode == OpCode.MSG_MOVE_JUMP and \
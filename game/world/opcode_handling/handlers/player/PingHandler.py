@@ -8,6 +8,6 @@ class PingHandler(object):
     @staticmethod
     def handle(world_session, socket, reader):
         if len(reader.data) >= 4:  # Avoid handling empty ping packet
-            socket.sendall(PacketWriter.get_packet(OpCode.SMSG_PONG, reader.data))
+            world_session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_PONG, reader.data))
 
         return 0
@@ -1,7 +1,6 @@
 from game.world.WorldSessionStateHandler import WorldSessionStateHandler
 from game.world.managers.GridManager import GridManager
-from network.packet.PacketReader import *
-from struct import pack, unpack, error
+from struct import Struct
 from game.world.managers.ChatManager import ChatManager
 from utils.constants.ObjectCodes import ChatMsgs, ChatFlags, Languages
 from utils.ConfigManager import config
@@ -9,12 +8,15 @@ from game.world.managers.CommandManager import CommandManager
 from database.realm.RealmDatabaseManager import RealmDatabaseManager
 from utils.Logger import Logger
 
+# Chat type, language
+CHAT_HEADER_STRUCT = Struct('<2I')
+
 
 class ChatHandler(object):
 
     @staticmethod
     def handle(world_session, socket, reader):
-        chat_type, lang = unpack('<2I', reader.data[:8])
+        chat_type, lang = reader.read_struct(CHAT_HEADER_STRUCT)
         message = ''
         guid = 0
         chat_flags = 0
@@ -31,7 +33,7 @@ class ChatHandler(object):
         if chat_type == ChatMsgs.CHAT_MSG_SAY \
                 or chat_type == ChatMsgs.CHAT_MSG_EMOTE \
                 or chat_type == ChatMsgs.CHAT_MSG_YELL:
-            message = PacketReader.read_string(reader.data, 8)
+            message = reader.read_cstring()
             guid = world_session.player_mgr.guid
             chat_flags = world_session.player_mgr.chat_flags
 
@@ -41,13 +43,13 @@ class ChatHandler(object):
                                               ChatHandler.get_range_by_type(chat_type))
         # Whisper
         elif chat_type == ChatMsgs.CHAT_MSG_WHISPER:
-            target_name = PacketReader.read_string(reader.data, 8).strip()
+            target_name = reader.read_cstring().strip()
             target_player_mgr = WorldSessionStateHandler.find_player_by_name(target_name)
             if not target_player_mgr:
                 ChatManager.send_system_message(world_session, 'No player named \'%s\' is currently playing.'
                                                 % target_name.capitalize())
                 return 0
-            message = PacketReader.read_string(reader.data, 8 + len(target_name)+1)
+            message = reader.read_cstring()
             if not ChatHandler.check_if_command(world_session, message):
                 # Always whisper in universal language when speaking with a GM
                 if target_player_mgr.is_gm:
@@ -58,13 +60,13 @@ class ChatHandler(object):
         # Party
         elif chat_type == ChatMsgs.CHAT_MSG_PARTY:
             if not ChatHandler.check_if_command(world_session, message):
-                message = PacketReader.read_string(reader.data, 8)
+                message = reader.read_cstring()
                 ChatManager.send_party(world_session.player_mgr, message, lang)
             return 0
         # Guild
         elif chat_type == ChatMsgs.CHAT_MSG_GUILD or chat_type == ChatMsgs.CHAT_MSG_OFFICER:
             if not ChatHandler.check_if_command(world_session, message):
-                message = PacketReader.read_string(reader.data, 8)
+                message = reader.read_cstring()
                 ChatManager.send_guild(world_session.player_mgr, message, lang, chat_type)
             return 0
 
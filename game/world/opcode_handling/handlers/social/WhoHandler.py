@@ -1,45 +1,36 @@
-from struct import pack, unpack
+from struct import pack, Struct
 from database.world.WorldDatabaseManager import WorldDatabaseManager
 from game.world.WorldSessionStateHandler import WorldSessionStateHandler
 from game.world.managers.GridManager import GridManager
 from network.packet.PacketWriter import *
 from network.packet.PacketReader import *
 
+LEVEL_RANGE_STRUCT = Struct('<2I')
+# Race mask, class mask, zone count
+MASKS_STRUCT = Struct('<3I')
+
 
 class WhoHandler(object):
 
     @staticmethod
     def handle(world_session, socket, reader):
-        if len(reader.data) > 0:  # Avoid handling empty who packet
+        if reader.remaining() > 0:  # Avoid handling empty who packet
             # TODO: Search for guild and faction handling
-            level_min, level_max = unpack('<2I', reader.data[:8])
-
-            current_size = 8
-            player_name = PacketReader.read_string(reader.data, current_size)
-            guild_name = PacketReader.read_string(reader.data, current_size + len(player_name))
+            level_min, level_max = reader.read_struct(LEVEL_RANGE_STRUCT)
+            player_name = reader.read_cstring()
+            guild_name = reader.read_cstring()
 
-            current_size += len(player_name) + len(guild_name) + 2
-            race_mask, class_mask, zone_count = unpack('<3I', reader.data[current_size:current_size + 12])
+            race_mask, class_mask, zone_count = reader.read_struct(MASKS_STRUCT)
             if zone_count > 10:
                 return 0
 
-            current_size += 12
-            zones = []
-            for x in range(0, zone_count):
-                zone = unpack('<I', reader.data[current_size:current_size + 4])[0]
-                zones.append(zone)
-                current_size += 4
+            zones = [reader.read_uint32() for x in range(0, zone_count)]
 
-            user_strings_count = unpack('<I', reader.data[current_size:current_size + 4])[0]
+            user_strings_count = reader.read_uint32()
             if user_strings_count > 4:
                 return 0
 
-            current_size += 4
-            user_strings = []
-            for x in range(0, user_strings_count):
-                user_string = PacketReader.read_string(reader.data, current_size)
-                user_strings.append(user_string)
-                current_size += len(user_string)
+            user_strings = [reader.read_cstring() for x in range(0, user_strings_count)]
 
             online_count = 0
             player_count = 0
@@ -52,7 +43,7 @@ class WhoHandler(object):
 
                     if session.player_mgr.level < level_min or session.player_mgr.level > level_max:
                         continue
-                    if player_name and not player_name.lower() in session.player_mgr.player.name.lower:
+                    if player_name and not player_name.lower() in session.player_mgr.player.name.lower():
                         continue
                     if session.player_mgr.guild_manager and guild_name and guild_name.lower() not in session.player_mgr.guild_manager.guild_name.lower():
                         continue
@@ -96,6 +87,6 @@ class WhoHandler(object):
                     player_count += 1
 
             data = pack('<2I', player_count, online_count if online_count > 49 else player_count) + player_data
-            socket.sendall(PacketWriter.get_packet(OpCode.SMSG_WHO, data))
+            world_session.enqueue_packet(PacketWriter.get_packet(OpCode.SMSG_WHO, data))
 
         return 0
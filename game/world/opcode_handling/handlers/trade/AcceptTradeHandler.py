@@ -63,7 +63,7 @@ class AcceptTradeHandler(object):
                                               show_item_get=False)
 
                     other_player.inventory.mark_as_removed(other_player_item)
-                    other_player.session.request.sendall(other_player_item.get_destroy_packet())
+                    other_player.session.enqueue_packet(other_player_item.get_destroy_packet())
                     other_player.inventory.get_container(other_player_item.item_instance.bag).remove_item(
                         other_player_item)
 
@@ -73,7 +73,7 @@ class AcceptTradeHandler(object):
                                                     show_item_get=False)
 
                     player.inventory.mark_as_removed(player_item)
-                    player.session.request.sendall(player_item.get_destroy_packet())
+                    player.session.enqueue_packet(player_item.get_destroy_packet())
                     player.inventory.get_container(player_item.item_instance.bag).remove_item(player_item)
 
             player.mod_money(other_player_trade.money)
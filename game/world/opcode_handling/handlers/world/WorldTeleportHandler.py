@@ -4,6 +4,7 @@ from game.world.managers.abstractions.Vector import Vector
 from network.packet.PacketWriter import *
 from utils.Logger import Logger
 from game.world.managers.GridManager import GridManager
+from game.world.opcode_handling.handlers.player.NameQueryHandler import NameQueryHandler
 from utils.constants.ObjectCodes import UpdateTypes
 
 
@@ -23,9 +24,9 @@ class WorldTeleportHandler(object):
     @staticmethod
     def handle_ack(world_session, socket, reader):
         world_session.player_mgr.send_update_self(create=True, force_inventory_update=True, reset_fields=False)
-        world_session.player_mgr.send_update_surrounding(world_session.player_mgr.generate_proper_update_packet(
-            create=True), include_self=False, create=True, force_inventory_update=True)
+        # Entering the grid again sends our create to surrounding players and resyncs what we see
         GridManager.update_object(world_session.player_mgr)
+        world_session.enqueue_packet(NameQueryHandler.get_query_details(world_session.player_mgr.player))
         world_session.player_mgr.reset_fields()
 
         world_session.player_mgr.is_teleporting = False
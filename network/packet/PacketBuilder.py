@@ -0,0 +1,36 @@
+from struct import Struct
+
+# Server packet header: Size: 2 bytes (big endian, includes Cmd) + Cmd: 4 bytes
+# Size is written as two bytes so the whole packet can be described by a single little endian Struct.
+HEADER_FORMAT = '<2BI'
+HEADER_SIZE = 6
+HEADER_STRUCT = Struct(HEADER_FORMAT)
+
+
+# Builds fixed layout packets (header included) with a precompiled Struct, so each packet is a single pack() call
+# and a single allocation. Packets ending in a list of same sized entries (e.g. waypoints) can set repeated_format,
+# one Struct is then compiled and cached per entry count.
+class PacketBuilder(object):
+    def __init__(self, opcode, body_format, repeated_format=''):
+        self.opcode = int(opcode)
+        self.body_format = body_format.lstrip('<')
+        self.repeated_format = repeated_format.lstrip('<')
+        self.structs = {}
+        self.struct, self.size_high, self.size_low = self._get_struct(0)
+
+    def _get_struct(self, count):
+        entry = self.structs.get(count)
+        if not entry:
+            struct_ = Struct(HEADER_FORMAT + self.body_format + self.repeated_format * count)
+            size = struct_.size - 2
+            entry = (struct_, size >> 8, size & 0xFF)
+            self.structs[count] = entry
+        return entry
+
+    def build(self, *values):
+        return self.struct.pack(self.size_high, self.size_low, self.opcode, *values)
+
+    # `repeated_values` must hold the flattened values of all `count` entries.
+    def build_repeated(self, count, values, repeated_values):
+        struct_, size_high, size_low = self._get_struct(count)
+        return struct_.pack(size_high, size_low, self.opcode, *values, *repeated_values)
@@ -1,29 +1,98 @@
-from struct import unpack
+from struct import Struct
 
 from utils.constants.OpCodes import *
 
+HEADER_SIZE = 6
+# Size is sent in big endian and includes the 4 bytes of the opcode
+SIZE_STRUCT = Struct('>H')
+OPCODE_STRUCT = Struct('<I')
 
+UINT8_STRUCT = Struct('<B')
+UINT16_STRUCT = Struct('<H')
+INT32_STRUCT = Struct('<i')
+UINT32_STRUCT = Struct('<I')
+UINT64_STRUCT = Struct('<Q')
+FLOAT_STRUCT = Struct('<f')
+VECTOR_STRUCT = Struct('<3f')
+POSITION_STRUCT = Struct('<4f')
+
+
+# Reads the payload in place through a cursor instead of slicing it. `data` is still available for handlers which
+# work on the raw payload bytes, but it's only built the first time it's accessed.
 class PacketReader(object):
     def __init__(self, data):
-        if len(data) > 5:
-            size, opcode = unpack(
-                '<HI', data[0:6]
-            )
+        self.buffer = data
+        self.offset = HEADER_SIZE
+        self._data = None
 
-            self.size = (size / 0x100) - 4
-            self.opcode = opcode
-            self.data = data[6:]
+        if len(data) > 5:
+            self.size = SIZE_STRUCT.unpack_from(data, 0)[0] - 4
+            self.opcode = OPCODE_STRUCT.unpack_from(data, 2)[0]
         else:
             self.size = 0
             self.opcode = 0
-            self.data = []
+            self._data = b''
+
+    @property
+    def data(self):
+        if self._data is None:
+            self._data = self.buffer[HEADER_SIZE:]
+        return self._data
+
+    # Payload as a zero copy view, can be concatenated to bytes directly.
+    def payload(self):
+        return memoryview(self.buffer)[HEADER_SIZE:]
+
+    def remaining(self):
+        return len(self.buffer) - self.offset
+
+    def skip(self, length):
+        self.offset += length
+
+    def read_struct(self, struct_):
+        values = struct_.unpack_from(self.buffer, self.offset)
+        self.offset += struct_.size
+        return values
+
+    def read_uint8(self):
+        return self.read_struct(UINT8_STRUCT)[0]
+
+    def read_uint16(self):
+        return self.read_struct(UINT16_STRUCT)[0]
+
+    def read_int32(self):
+        return self.read_struct(INT32_STRUCT)[0]
+
+    def read_uint32(self):
+        return self.read_struct(UINT32_STRUCT)[0]
+
+    def read_uint64(self):
+        return self.read_struct(UINT64_STRUCT)[0]
+
+    def read_float(self):
+        return self.read_struct(FLOAT_STRUCT)[0]
+
+    # Returns (x, y, z), or (x, y, z, o) if orientation is included.
+    def read_vector(self, with_orientation=False):
+        return self.read_struct(POSITION_STRUCT if with_orientation else VECTOR_STRUCT)
+
+    def read_bytes(self, length=-1):
+        end = len(self.buffer) if length < 0 else self.offset + length
+        value = self.buffer[self.offset:end]
+        self.offset = end
+        return value
+
+    def read_cstring(self):
+        end = self.buffer.find(b'\x00', self.offset)
+        if end == -1:
+            end = len(self.buffer)
+        value = self.buffer[self.offset:end].decode('latin-1')
+        self.offset = min(end + 1, len(self.buffer))
+        return value
 
     @staticmethod
     def read_string(packet, start, terminator='\x00'):
-        char_list = []
-        for ci in packet[start:]:
-            cc = chr(ci)
-            if cc == terminator:
-                break
-            char_list.append(cc)
-        return ''.join(char_list)
+        end = packet.find(terminator.encode('latin-1'), start)
+        if end == -1:
+            end = len(packet)
+        return packet[start:end].decode('latin-1')
@@ -1,8 +1,11 @@
-from struct import pack, calcsize
+from struct import Struct
 import zlib
 
+from network.packet.PacketBuilder import HEADER_STRUCT
 from utils.constants.OpCodes import *
 
+AUTH_CHALLENGE_HEADER_STRUCT = Struct('<2BH')
+
 
 class PacketWriter(object):
     @staticmethod
@@ -18,16 +21,12 @@ class PacketWriter(object):
 
         # Packet header for SMSG_AUTH_CHALLENGE : Size: 2 bytes + Cmd: 2 bytes
         # Packet header : Size: 2 bytes + Cmd: 4 bytes
-        size = (4 if opcode == OpCode.SMSG_AUTH_CHALLENGE else 6) + len(data) - 2
-        base_header = pack('<4B',
-                           int(size / 0x100),
-                           int(size % 0x100),
-                           int(opcode % 0x100),
-                           int(opcode / 0x100))
         if opcode == OpCode.SMSG_AUTH_CHALLENGE:
-            return base_header + data
-        else:
-            return base_header + pack('<BB', 0, 0) + data
+            size = len(data) + 2
+            return AUTH_CHALLENGE_HEADER_STRUCT.pack(size >> 8, size & 0xFF, opcode) + data
+
+        size = len(data) + 4
+        return HEADER_STRUCT.pack(size >> 8, size & 0xFF, opcode) + data
 
     @staticmethod
     def deflate(data):
@@ -0,0 +1,46 @@
+from struct import unpack_from
+
+# Client packet header: Size: 2 bytes (big endian, includes Cmd) + Cmd: 4 bytes
+HEADER_SIZE = 6
+SIZE_FIELD_LENGTH = 2
+OPCODE_FIELD_LENGTH = 4
+RECV_CHUNK_SIZE = 65536
+
+
+class ReceiveBuffer(object):
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def __len__(self):
+        return len(self.buffer)
+
+    def append(self, data):
+        self.buffer += data
+
+    def clear(self):
+        self.buffer.clear()
+
+    # Slices every complete frame currently in the buffer, leaving any incomplete trailing frame for the next read.
+    # Returns None if the stream is corrupt (declared size smaller than the opcode field), since we can't resync then.
+    def pop_frames(self):
+        frames = []
+        offset = 0
+        buffer_length = len(self.buffer)
+
+        while buffer_length - offset >= HEADER_SIZE:
+            size = unpack_from('>H', self.buffer, offset)[0]
+            if size < OPCODE_FIELD_LENGTH:
+                self.clear()
+                return None
+
+            frame_size = SIZE_FIELD_LENGTH + size
+            if buffer_length - offset < frame_size:
+                break
+
+            frames.append(bytes(self.buffer[offset:offset + frame_size]))
+            offset += frame_size
+
+        if offset > 0:
+            del self.buffer[:offset]
+
+        return frames
@@ -0,0 +1,192 @@
+import asyncio
+import socket
+import threading
+from queue import Queue, Full
+
+from utils.Logger import Logger
+
+# Max seconds a stopping queue waits for its writer to send what is still queued.
+STOP_TIMEOUT = 2.0
+
+
+# Bounded outbound packet queue drained by a single writer thread, keeping per-client packet order and avoiding
+# a new thread per sendall. If a client can't keep up and the queue fills, the connection is dropped.
+#
+# With coalescing enabled, packets are accumulated until flush() is called (once per world tick) or until max_bytes
+# are pending, and then handed to the writer as a single buffer so they go out with one sendall.
+class SendQueue(object):
+    def __init__(self, request, max_size, coalesce=False, max_bytes=0):
+        self.request = request
+        self.max_size = max_size
+        self.queue = Queue(maxsize=max_size)
+        self.max_depth = 0
+        self.overflowed = False
+        self.writer = None
+
+        self.coalesce = coalesce
+        self.max_bytes = max_bytes
+        self.batch = []
+        self.batch_bytes = 0
+        self.batch_lock = threading.Lock()
+
+    def start(self):
+        self.writer = threading.Thread(target=self._drain)
+        self.writer.daemon = True
+        self.writer.start()
+
+    # Sends what is still queued (e.g. a failed auth response) before returning, so the connection can be closed.
+    def stop(self):
+        self.flush()
+        if not self.writer or not self.writer.is_alive():
+            return
+
+        try:
+            # Waits for room if the queue is full, the writer only exits on the sentinel
+            self.queue.put(None, timeout=STOP_TIMEOUT)
+        except Full:
+            # Writer stuck on a client not reading, closing the socket makes its sendall fail
+            return
+        self.writer.join(STOP_TIMEOUT)
+
+    def put(self, packet):
+        if self.overflowed:
+            return
+
+        if not self.coalesce:
+            self._enqueue(packet)
+            return
+
+        with self.batch_lock:
+            self.batch.append(packet)
+            self.batch_bytes += len(packet)
+            should_flush = self.batch_bytes >= self.max_bytes
+
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        with self.batch_lock:
+            if not self.batch:
+                return
+            data = self.batch[0] if len(self.batch) == 1 else b''.join(self.batch)
+            self.batch = []
+            self.batch_bytes = 0
+
+        self._enqueue(data)
+
+    def depth(self):
+        return self.queue.qsize()
+
+    def _enqueue(self, data):
+        try:
+            self.queue.put_nowait(data)
+        except Full:
+            self._on_overflow()
+            return
+
+        depth = self.queue.qsize()
+        if depth > self.max_depth:
+            self.max_depth = depth
+
+    def _on_overflow(self):
+        self.overflowed = True
+        Logger.warning('Outbound queue full (%u packets), dropping slow connection.' % self.max_size)
+        try:
+            self.request.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+
+    def _drain(self):
+        while True:
+            packet = self.queue.get()
+            if packet is None:
+                break
+            try:
+                self.request.sendall(packet)
+            except OSError:
+                break
+
+
+# Same as SendQueue, but drained by a coroutine on the given event loop. Producers can live on any thread. The
+# coroutine stops writing while the transport buffer is above its high-water mark (pause_writing/resume_writing of the
+# protocol), so a slow client makes `pending` grow until the connection is dropped, as with the threaded writer.
+class AsyncSendQueue(SendQueue):
+    def __init__(self, request, max_size, loop, coalesce=False, max_bytes=0):
+        super().__init__(request, max_size, coalesce, max_bytes)
+        self.loop = loop
+        self.pending = 0
+        self.pending_lock = threading.Lock()
+        self.can_write = None
+        self.connection_closed = False
+        self.writer_task = None
+
+    def start(self):
+        # Bounds are enforced through the pending counter in _enqueue(), as producers are not on the loop thread
+        self.queue = asyncio.Queue()
+        self.can_write = asyncio.Event()
+        self.can_write.set()
+        self.writer_task = self.loop.create_task(self._drain_async())
+
+    # The writer sends what is still queued and closes the transport itself, a client not reading is aborted after
+    # STOP_TIMEOUT.
+    def stop(self):
+        self.flush()
+        if self.writer_task:
+            self.loop.call_soon_threadsafe(self.queue.put_nowait, None)
+            self.loop.call_soon_threadsafe(self.loop.call_later, STOP_TIMEOUT, self._abort)
+
+    # Called from the protocol on the loop thread.
+    def pause_writing(self):
+        if self.can_write:
+            self.can_write.clear()
+
+    def resume_writing(self):
+        if self.can_write:
+            self.can_write.set()
+
+    def connection_lost(self):
+        self.connection_closed = True
+        # Nothing will be written anymore, let the writer skip the rest and exit
+        self.resume_writing()
+
+    def _abort(self):
+        if not self.connection_closed:
+            self.request.transport.abort()
+
+    def depth(self):
+        return self.pending
+
+    def _enqueue(self, data):
+        with self.pending_lock:
+            if self.pending >= self.max_size:
+                overflowed = True
+            else:
+                overflowed = False
+                self.pending += 1
+                if self.pending > self.max_depth:
+                    self.max_depth = self.pending
+
+        if overflowed:
+            self._on_overflow()
+            return
+        self.loop.call_soon_threadsafe(self.queue.put_nowait, data)
+
+    def _on_overflow(self):
+        self.overflowed = True
+        Logger.warning('Outbound queue full (%u packets), dropping slow connection.' % self.max_size)
+        self.loop.call_soon_threadsafe(self._abort)
+
+    async def _drain_async(self):
+        transport = self.request.transport
+        while True:
+            packet = await self.queue.get()
+            if packet is None:
+                transport.close()
+                return
+
+            await self.can_write.wait()
+            with self.pending_lock:
+                self.pending -= 1
+            if transport.is_closing():
+                continue
+            transport.write(packet)
@@ -0,0 +1,51 @@
+from struct import pack
+
+from network.packet.PacketWriter import PacketWriter
+from network.packet.update.UpdatePacketFactory import UpdatePacketFactory
+from utils.constants.OpCodes import OpCode
+
+# Uncompressed payload budget per SMSG_UPDATE_OBJECT, keeps every packet well below the 16 bit size header.
+MAX_PAYLOAD_SIZE = 32768
+
+
+# Gathers update blocks of many objects into as few SMSG_UPDATE_OBJECT packets as possible, each one compressed once.
+class UpdateBatch(object):
+    def __init__(self):
+        self.blocks = []
+        self.payload_size = 0
+        self.packets = []
+
+    def __len__(self):
+        return len(self.blocks)
+
+    def add_create(self, world_obj, is_self=False):
+        self.add_transaction(world_obj.get_full_update_packet(is_self=is_self))
+
+    # Object update builders return a single transaction: uint32 transaction count (1) followed by the block.
+    def add_transaction(self, data):
+        if data:
+            self._add_block(data[4:])
+
+    def get_packets(self):
+        self._finish_packet()
+        packets = self.packets
+        self.packets = []
+        return packets
+
+    def _add_block(self, block):
+        if self.blocks and self.payload_size + len(block) > MAX_PAYLOAD_SIZE:
+            self._finish_packet()
+
+        self.blocks.append(block)
+        self.payload_size += len(block)
+
+    def _finish_packet(self):
+        if not self.blocks:
+            return
+
+        data = pack('<I', len(self.blocks)) + b''.join(self.blocks)
+        self.packets.append(UpdatePacketFactory.compress_if_needed(
+            PacketWriter.get_packet(OpCode.SMSG_UPDATE_OBJECT, data)))
+
+        self.blocks = []
+        self.payload_size = 0
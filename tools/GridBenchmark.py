@@ -0,0 +1,87 @@
+import math
+import os
+import random
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from game.world.managers.GridManager import GridManager, Grid, GRIDS, GRID_SIZE
+from game.world.managers.abstractions.Vector import Vector
+
+# Compares grid key computation and surrounding grid lookups with the previous string keyed implementation.
+#
+# Usage: python3 tools/GridBenchmark.py [iterations]
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+TOLERANCE = 0.00001
+
+
+class BenchObject(object):
+    def __init__(self, x, y, map_):
+        self.location = Vector(x, y, 0)
+        self.map_ = map_
+
+
+def legacy_generate_coord_data(vector):
+    mod_x = vector.x / GRID_SIZE
+    mod_y = vector.y / GRID_SIZE
+
+    max_x = math.ceil(mod_x) * GRID_SIZE - TOLERANCE
+    max_y = math.ceil(mod_y) * GRID_SIZE - TOLERANCE
+    min_x = max_x - GRID_SIZE + TOLERANCE
+    min_y = max_y - GRID_SIZE + TOLERANCE
+
+    return min_x, min_y, max_x, max_y
+
+
+def legacy_get_grid_key(vector, map_):
+    min_x, min_y, max_x, max_y = legacy_generate_coord_data(vector)
+    return '%u:%u:%u:%u:%u' % (round(min_x, 5), round(min_y, 5), round(max_x, 5), round(max_y, 5), map_)
+
+
+def legacy_get_surrounding(world_obj, legacy_grids):
+    vector = world_obj.location
+    near_grids = set()
+    for x in range(-1, 2):
+        for y in range(-1, 2):
+            grid_coords = legacy_get_grid_key(Vector(vector.x + (x * GRID_SIZE), vector.y + (y * GRID_SIZE), 0),
+                                              world_obj.map_)
+            if grid_coords in legacy_grids:
+                near_grids.add(legacy_grids[grid_coords])
+    return near_grids
+
+
+def report(name, legacy, current):
+    legacy_time = timeit.timeit(legacy, number=ITERATIONS)
+    current_time = timeit.timeit(current, number=ITERATIONS)
+    print('%-18s legacy %6.0fns | current %6.0fns | %.2fx' % (
+        name, legacy_time / ITERATIONS * 1e9, current_time / ITERATIONS * 1e9, legacy_time / current_time))
+
+
+if __name__ == '__main__':
+    # Populate a 20x20 cell area (~4000 yards) on both implementations
+    legacy_grids = {}
+    for cell_x in range(-10, 10):
+        for cell_y in range(-10, 10):
+            grid = Grid(0, cell_x, cell_y)
+            GRIDS[grid.key] = grid
+            center = Vector(cell_x * GRID_SIZE + GRID_SIZE / 2, cell_y * GRID_SIZE + GRID_SIZE / 2)
+            legacy_grids[legacy_get_grid_key(center, 0)] = grid
+
+    objects = [BenchObject(random.uniform(-1800, 1800), random.uniform(-1800, 1800), 0) for _ in range(256)]
+    assert all(len(legacy_get_surrounding(obj, legacy_grids)) == len(GridManager.get_surrounding(obj))
+               for obj in objects)
+
+    index = [0]
+
+    def next_object():
+        index[0] = (index[0] + 1) & 255
+        return objects[index[0]]
+
+    report('get_grid_key',
+           lambda: legacy_get_grid_key(next_object().location, 0),
+           lambda: GridManager.get_grid_key(next_object().location, 0))
+    report('get_surrounding',
+           lambda: legacy_get_surrounding(next_object(), legacy_grids),
+           lambda: GridManager.get_surrounding(next_object()))
@@ -0,0 +1,346 @@
+import argparse
+import asyncio
+import math
+import random
+import sys
+import os
+from struct import pack, unpack_from
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.packet.ReceiveBuffer import ReceiveBuffer, RECV_CHUNK_SIZE
+from utils.constants.AuthCodes import AuthCode
+from utils.constants.CharCodes import CharCreate
+from utils.constants.ObjectCodes import ChatMsgs, MoveFlags
+from utils.constants.OpCodes import OpCode
+
+# Headless load generator for the world server. Each bot logs in (auto creating its account and character when
+# needed) and then keeps sending traffic according to its behavior profile, while CMSG_PING round trips are used to
+# measure server side latency.
+#
+# Usage: python3 tools/LoadGenerator.py --bots 100 --profile mixed --duration 300
+#
+# Accounts are only created on the fly if auto_create_accounts is enabled in the server config.
+
+# Seconds between each action, None disables it.
+PROFILES = {
+    'idle': {'move': None, 'chat': None, 'attack': None},
+    'walker': {'move': 0.5, 'chat': None, 'attack': None},
+    'chatty': {'move': None, 'chat': 2.0, 'attack': None},
+    'fighter': {'move': 1.0, 'chat': None, 'attack': 3.0},
+    'mixed': {'move': 0.5, 'chat': 10.0, 'attack': 15.0},
+}
+
+# Human warrior.
+DEFAULT_CHARACTER = (1, 1, 0, 0, 0, 0, 0, 0, 0)  # race, class, gender, skin, face, hairstyle, haircolor, facialhair, outfit
+MOVE_RADIUS = 10.0
+# Bots move at run speed, in yards per second.
+MOVE_SPEED = 7.0
+LOGIN_TIMEOUT = 30
+
+
+def client_packet(opcode, data=b''):
+    # Client packet header: Size: 2 bytes (big endian, includes Cmd) + Cmd: 4 bytes
+    return pack('>H', len(data) + 4) + pack('<I', opcode) + data
+
+
+def character_name(prefix, index):
+    # Names can only contain letters.
+    suffix = ''
+    while True:
+        index, remainder = divmod(index, 26)
+        suffix = chr(ord('a') + remainder) + suffix
+        if index == 0:
+            break
+    return (prefix + suffix)[:12].capitalize()
+
+
+class LoadStats(object):
+    def __init__(self):
+        self.online = 0
+        self.failed = 0
+        self.packets_sent = 0
+        self.bytes_sent = 0
+        self.packets_received = 0
+        self.bytes_received = 0
+        self.login_times = []
+        self.latencies = []
+
+    @staticmethod
+    def percentile(samples, pct):
+        if not samples:
+            return 0.0
+        ordered = sorted(samples)
+        return ordered[min(len(ordered) - 1, int(math.ceil(len(ordered) * pct / 100.0)) - 1)]
+
+    def report(self, elapsed, interval, last):
+        sent_packets, sent_bytes, received_packets, received_bytes = last
+        latencies = self.latencies
+        self.latencies = []
+
+        print('[%7.1fs] online %u, failed %u | out %u pkt/s %.1f KB/s | in %u pkt/s %.1f KB/s | '
+              'rtt p50 %.1fms p99 %.1fms max %.1fms' % (
+                  elapsed, self.online, self.failed,
+                  (self.packets_sent - sent_packets) / interval, (self.bytes_sent - sent_bytes) / 1024.0 / interval,
+                  (self.packets_received - received_packets) / interval,
+                  (self.bytes_received - received_bytes) / 1024.0 / interval,
+                  LoadStats.percentile(latencies, 50) * 1000, LoadStats.percentile(latencies, 99) * 1000,
+                  max(latencies, default=0.0) * 1000))
+
+        return self.packets_sent, self.bytes_sent, self.packets_received, self.bytes_received
+
+
+class LoadBot(object):
+    def __init__(self, index, args, stats, guids):
+        self.index = index
+        self.args = args
+        self.stats = stats
+        self.guids = guids
+        self.profile = PROFILES[args.profile]
+
+        self.username = '%s%u' % (args.account_prefix, index)
+        self.name = character_name(args.name_prefix, index)
+        self.guid = 0
+        self.map_ = 0
+        self.home = (0.0, 0.0, 0.0)
+        self.angle = random.uniform(0, 2 * math.pi)
+
+        self.reader = None
+        self.writer = None
+        self.receive_buffer = ReceiveBuffer()
+        self.waiters = {}
+        self.pings = {}
+        self.ping_sequence = 0
+
+    def send(self, opcode, data=b''):
+        packet = client_packet(opcode, data)
+        self.writer.write(packet)
+        self.stats.packets_sent += 1
+        self.stats.bytes_sent += len(packet)
+
+    def watch(self, opcode):
+        future = asyncio.get_running_loop().create_future()
+        self.waiters[opcode] = future
+        return future
+
+    async def expect(self, opcode):
+        return await asyncio.wait_for(self.watch(opcode), LOGIN_TIMEOUT)
+
+    async def read_loop(self):
+        while True:
+            data = await self.reader.read(RECV_CHUNK_SIZE)
+            if not data:
+                raise ConnectionError('Connection closed by server.')
+
+            self.receive_buffer.append(data)
+            frames = self.receive_buffer.pop_frames()
+            if frames is None:
+                raise ConnectionError('Received corrupt data.')
+
+            for frame in frames:
+                self.stats.packets_received += 1
+                self.stats.bytes_received += len(frame)
+                self.handle_frame(frame)
+
+    def handle_frame(self, frame):
+        # Server packet header: Size: 2 bytes + Cmd: 4 bytes, SMSG_AUTH_CHALLENGE only sends 2 bytes of Cmd
+        opcode = unpack_from('<H', frame, 2)[0]
+        data = frame[4:] if opcode == OpCode.SMSG_AUTH_CHALLENGE else frame[6:]
+
+        if opcode == OpCode.SMSG_PONG and len(data) >= 4:
+            sent_at = self.pings.pop(unpack_from('<I', data)[0], None)
+            if sent_at:
+                self.stats.latencies.append(perf_counter() - sent_at)
+            return
+
+        future = self.waiters.pop(opcode, None)
+        if future and not future.done():
+            future.set_result(data)
+
+    async def login(self, auth_challenge):
+        await asyncio.wait_for(auth_challenge, LOGIN_TIMEOUT)
+
+        credentials = ('%s %s' % (self.username, self.args.password)).encode('ascii') + b'\x00'
+        self.send(OpCode.CMSG_AUTH_SESSION, pack('<II', self.args.build, 0) + credentials)
+        auth_code = (await self.expect(OpCode.SMSG_AUTH_RESPONSE))[0]
+        if auth_code != AuthCode.AUTH_OK:
+            raise ConnectionError('Authentication failed (%s).' % AuthCode(auth_code).name)
+
+        if not self.read_character(await self.enum_characters()):
+            name_bytes = self.name.encode('ascii') + b'\x00'
+            self.send(OpCode.CMSG_CHAR_CREATE, name_bytes + pack('<9B', *DEFAULT_CHARACTER))
+            create_result = (await self.expect(OpCode.SMSG_CHAR_CREATE))[0]
+            if create_result != CharCreate.CHAR_CREATE_SUCCESS:
+                raise ConnectionError('Character creation failed (%s).' % CharCreate(create_result).name)
+            if not self.read_character(await self.enum_characters()):
+                raise ConnectionError('Created character not found.')
+
+        self.send(OpCode.CMSG_PLAYER_LOGIN, pack('<Q', self.guid))
+        await self.expect(OpCode.SMSG_LOGIN_SETTIMESPEED)
+
+    async def enum_characters(self):
+        self.send(OpCode.CMSG_CHAR_ENUM)
+        return await self.expect(OpCode.SMSG_CHAR_ENUM)
+
+    def read_character(self, data):
+        # Only the first character of the account is used: guid, name, race, class, 6 appearance bytes, level, zone,
+        # map and position
+        if not data or data[0] == 0:
+            return False
+
+        self.guid = unpack_from('<Q', data, 1)[0]
+        offset = data.index(b'\x00', 9) + 1 + 9
+        _zone, self.map_, x, y, z = unpack_from('<2I3f', data, offset)
+        self.home = (x, y, z)
+        return True
+
+    def send_movement(self, elapsed):
+        # Walk in circles around the login position, well within the server's desync distance.
+        self.angle += MOVE_SPEED * elapsed / MOVE_RADIUS
+        x = self.home[0] + MOVE_RADIUS * math.cos(self.angle)
+        y = self.home[1] + MOVE_RADIUS * math.sin(self.angle)
+        o = (self.angle + math.pi / 2) % (2 * math.pi)
+        self.send(OpCode.MSG_MOVE_HEARTBEAT, pack('<Q9fI', 0, 0, 0, 0, 0, x, y, self.home[2], o, 0,
+                                                  MoveFlags.MOVEFLAG_FORWARD))
+
+    def send_chat(self):
+        message = ('Load test message %u from %s' % (random.randint(0, 100000), self.name)).encode('ascii')
+        self.send(OpCode.CMSG_MESSAGECHAT, pack('<2I', ChatMsgs.CHAT_MSG_SAY, 0) + message + b'\x00')
+
+    def send_attack(self):
+        targets = [guid for guid in self.guids if guid != self.guid]
+        if not targets:
+            return
+        target = random.choice(targets)
+        self.send(OpCode.CMSG_SET_SELECTION, pack('<Q', target))
+        self.send(OpCode.CMSG_ATTACKSWING, pack('<Q', target))
+
+    def send_ping(self):
+        self.ping_sequence += 1
+        self.pings[self.ping_sequence] = perf_counter()
+        self.send(OpCode.CMSG_PING, pack('<I', self.ping_sequence))
+
+    async def act(self):
+        timers = {action: random.uniform(0, interval) for action, interval in self.profile.items() if interval}
+        next_ping = random.uniform(0, self.args.ping_interval)
+        last_tick = perf_counter()
+
+        while True:
+            await asyncio.sleep(0.1)
+            now = perf_counter()
+            elapsed = now - last_tick
+            last_tick = now
+
+            next_ping -= elapsed
+            if next_ping <= 0:
+                next_ping += self.args.ping_interval
+                self.send_ping()
+
+            for action in timers:
+                timers[action] -= elapsed
+                if timers[action] > 0:
+                    continue
+                timers[action] += self.profile[action]
+                if action == 'move':
+                    self.send_movement(self.profile[action])
+                elif action == 'chat':
+                    self.send_chat()
+                elif action == 'attack':
+                    self.send_attack()
+
+            await self.writer.drain()
+
+    async def run(self):
+        online = False
+        tasks = []
+        try:
+            login_start = perf_counter()
+            self.reader, self.writer = await asyncio.open_connection(self.args.host, self.args.port)
+            # The server sends SMSG_AUTH_CHALLENGE right away, so start watching for it before reading.
+            auth_challenge = self.watch(OpCode.SMSG_AUTH_CHALLENGE)
+            read_task = asyncio.ensure_future(self.read_loop())
+            login_task = asyncio.ensure_future(self.login(auth_challenge))
+            tasks.extend([read_task, login_task])
+
+            done, _ = await asyncio.wait([read_task, login_task], return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+
+            self.stats.login_times.append(perf_counter() - login_start)
+            self.stats.online += 1
+            self.guids.append(self.guid)
+            online = True
+
+            act_task = asyncio.ensure_future(self.act())
+            tasks.append(act_task)
+            done, _ = await asyncio.wait([read_task, act_task], return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                task.result()
+        except asyncio.CancelledError:
+            pass
+        except (ConnectionError, OSError, asyncio.TimeoutError, ValueError) as e:
+            self.stats.failed += 1
+            print('Bot %s failed: %s' % (self.username, e or e.__class__.__name__))
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if online:
+                self.stats.online -= 1
+                self.guids.remove(self.guid)
+            if self.writer:
+                self.writer.close()
+
+
+async def run_load(args):
+    stats = LoadStats()
+    guids = []
+    bots = []
+
+    for index in range(args.bots):
+        bots.append(asyncio.ensure_future(LoadBot(args.first_index + index, args, stats, guids).run()))
+        if args.ramp > 0:
+            await asyncio.sleep(args.ramp / args.bots)
+
+    start = last_report = perf_counter()
+    last = (0, 0, 0, 0)
+    while not args.duration or perf_counter() - start < args.duration:
+        await asyncio.sleep(args.report_interval)
+        now = perf_counter()
+        last = stats.report(now - start, now - last_report, last)
+        last_report = now
+        if all(bot.done() for bot in bots):
+            break
+
+    for bot in bots:
+        bot.cancel()
+    await asyncio.gather(*bots, return_exceptions=True)
+
+    print('Logins: %u ok, %u failed, login time p50 %.1fms p99 %.1fms' % (
+        len(stats.login_times), stats.failed,
+        LoadStats.percentile(stats.login_times, 50) * 1000, LoadStats.percentile(stats.login_times, 99) * 1000))
+    print('Totals: sent %u packets (%.1f KB), received %u packets (%.1f KB)' % (
+        stats.packets_sent, stats.bytes_sent / 1024.0, stats.packets_received, stats.bytes_received / 1024.0))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Headless load generator for the world server.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8100)
+    parser.add_argument('--build', type=int, default=3368, help='client build sent in CMSG_AUTH_SESSION')
+    parser.add_argument('--bots', type=int, default=10)
+    parser.add_argument('--first-index', type=int, default=0, help='index of the first bot account')
+    parser.add_argument('--profile', choices=sorted(PROFILES.keys()), default='mixed')
+    parser.add_argument('--account-prefix', default='loadbot')
+    parser.add_argument('--name-prefix', default='bot')
+    parser.add_argument('--password', default='loadbot')
+    parser.add_argument('--ramp', type=float, default=10.0, help='seconds over which bots connect')
+    parser.add_argument('--duration', type=float, default=60.0, help='seconds to run, 0 to run until stopped')
+    parser.add_argument('--ping-interval', type=float, default=1.0)
+    parser.add_argument('--report-interval', type=float, default=5.0)
+
+    try:
+        asyncio.run(run_load(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
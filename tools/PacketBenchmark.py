@@ -0,0 +1,72 @@
+import os
+import sys
+import timeit
+from struct import pack
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from network.packet.PacketBuilder import PacketBuilder
+from network.packet.PacketWriter import PacketWriter
+from utils.constants.OpCodes import OpCode
+
+# Compares the previous format string + concatenation way of building hot packets with the precompiled builders.
+# The legacy path creates a bytes object per pack() and per concatenation (4 to 5 + 1 per waypoint), builders create
+# only the final packet.
+#
+# Usage: python3 tools/PacketBenchmark.py [iterations]
+
+ITERATIONS = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+
+ATTACK_STATE_VALUES = (2, 0x10000001, 0xF1300000000001, 50, 1, 1, 50.0, 50, 0, 1, 0, 0, 0, 0)
+ATTACKER_STATE_UPDATE_BUILDER = PacketBuilder(OpCode.SMSG_ATTACKERSTATEUPDATE, '<I2QIBIf7I')
+
+WAYPOINTS = [(float(i), float(i * 2), 10.0) for i in range(4)]
+MONSTER_MOVE_BUILDER = PacketBuilder(OpCode.SMSG_MONSTER_MOVE, '<Q3fIBI2I', '<3f')
+
+
+def legacy_get_packet(opcode, data):
+    size = 6 + len(data) - 2
+    base_header = pack('<4B', int(size / 0x100), int(size % 0x100), int(opcode % 0x100), int(opcode / 0x100))
+    return base_header + pack('<BB', 0, 0) + data
+
+
+def legacy_attack_state():
+    return legacy_get_packet(OpCode.SMSG_ATTACKERSTATEUPDATE, pack('<I2QIBIf7I', *ATTACK_STATE_VALUES))
+
+
+def builder_attack_state():
+    return ATTACKER_STATE_UPDATE_BUILDER.build(*ATTACK_STATE_VALUES)
+
+
+def legacy_monster_move():
+    data = pack('<Q12sIBI', 0xF1300000000001, pack('<3f', 1.0, 2.0, 3.0), 1000, 0, 0)
+    waypoints_data = b''
+    for waypoint in WAYPOINTS:
+        waypoints_data += pack('<3f', *waypoint)
+    data += pack('<2I%us' % len(waypoints_data), 5000, len(WAYPOINTS), waypoints_data)
+    return legacy_get_packet(OpCode.SMSG_MONSTER_MOVE, data)
+
+
+def builder_monster_move():
+    waypoints_data = []
+    for waypoint in WAYPOINTS:
+        waypoints_data.extend(waypoint)
+    return MONSTER_MOVE_BUILDER.build_repeated(len(WAYPOINTS),
+                                               (0xF1300000000001, 1.0, 2.0, 3.0, 1000, 0, 0, 5000, len(WAYPOINTS)),
+                                               waypoints_data)
+
+
+def run(name, legacy, builder):
+    assert legacy() == builder(), '%s packets differ' % name
+    legacy_time = timeit.timeit(legacy, number=ITERATIONS)
+    builder_time = timeit.timeit(builder, number=ITERATIONS)
+    print('%-24s legacy %5.0fns | builder %5.0fns | %.2fx' % (
+        name, legacy_time / ITERATIONS * 1e9, builder_time / ITERATIONS * 1e9, legacy_time / builder_time))
+
+
+if __name__ == '__main__':
+    run('SMSG_ATTACKERSTATEUPDATE', legacy_attack_state, builder_attack_state)
+    run('SMSG_MONSTER_MOVE', legacy_monster_move, builder_monster_move)
+    run('get_packet header',
+        lambda: legacy_get_packet(OpCode.SMSG_PONG, b'\x01\x00\x00\x00'),
+        lambda: PacketWriter.get_packet(OpCode.SMSG_PONG, b'\x01\x00\x00\x00'))